@@ -0,0 +1,441 @@
+"""Deterministic stand-in for the ``MetaTrader5`` package.
+
+Selected by ``server.py`` when ``MT5_BACKEND=fake`` so the API can be run,
+profiled and load-tested on machines without a terminal (Linux CI).  It
+implements the subset of the MetaTrader5 API the server uses, with the same
+constants, structured-array dtypes and namedtuple-style records.
+
+Prices are a pure function of (symbol, tick index): every symbol ticks on a
+fixed ``FAKE_MT5_TICK_MS`` grid and its price is a blend of slow and fast
+sine waves plus hashed noise around a per-symbol base.  Ticks and bars are
+therefore identical across runs and processes, and any time range can be
+generated without state.
+
+Environment:
+
+* ``FAKE_MT5_SYMBOLS``        comma separated symbol names (default: majors)
+* ``FAKE_MT5_N_SYMBOLS``      add ``SYN000`` ... synthetic symbols up to N total
+* ``FAKE_MT5_TICK_MS``        tick interval per symbol in ms (default 250)
+* ``FAKE_MT5_LATENCY_MS``     simulated terminal round-trip per call (default 0)
+* ``FAKE_MT5_FILLING_MODE``   ``symbol_info().filling_mode`` bitmask (default 3 = FOK|IOC)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import zlib
+from collections import namedtuple
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from trader.core.bars import TF_SECONDS
+
+# ----------------------------------------------------------------------
+# Constants (values match the MetaTrader5 package)
+# ----------------------------------------------------------------------
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = 16385
+TIMEFRAME_H4 = 16388
+TIMEFRAME_D1 = 16408
+TIMEFRAME_W1 = 32769
+TIMEFRAME_MN1 = 49153
+
+COPY_TICKS_ALL = -1
+COPY_TICKS_INFO = 1
+COPY_TICKS_TRADE = 2
+
+TRADE_ACTION_DEAL = 1
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+ORDER_FILLING_FOK = 0
+ORDER_FILLING_IOC = 1
+ORDER_FILLING_RETURN = 2
+ORDER_TIME_GTC = 0
+SYMBOL_FILLING_FOK = 1
+SYMBOL_FILLING_IOC = 2
+
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_INVALID_VOLUME = 10014
+TRADE_RETCODE_INVALID_FILL = 10030
+
+_TF_SECONDS = {globals()[f"TIMEFRAME_{name}"]: seconds for name, seconds in TF_SECONDS.items()}
+
+RATES_DTYPE = np.dtype([
+    ("time", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8"),
+    ("tick_volume", "<u8"), ("spread", "<i4"), ("real_volume", "<u8"),
+])
+TICKS_DTYPE = np.dtype([
+    ("time", "<i8"), ("bid", "<f8"), ("ask", "<f8"), ("last", "<f8"), ("volume", "<u8"),
+    ("time_msc", "<i8"), ("flags", "<u4"), ("volume_real", "<f8"),
+])
+
+TerminalInfo = namedtuple("TerminalInfo", "connected trade_allowed name company path build")
+AccountInfo = namedtuple(
+    "AccountInfo", "login name server company currency balance equity margin margin_free profit leverage",
+)
+SymbolInfo = namedtuple("SymbolInfo", "name path description digits point spread filling_mode visible")
+Tick = namedtuple("Tick", "time bid ask last volume time_msc flags volume_real")
+TradePosition = namedtuple(
+    "TradePosition", "ticket symbol type volume price_open price_current sl tp profit time comment magic",
+)
+TradeOrder = namedtuple(
+    "TradeOrder",
+    "ticket symbol type type_time type_filling volume_current price_open sl tp time_setup comment magic",
+)
+TradeRequest = namedtuple("TradeRequest", "action symbol type volume price sl tp deviation type_filling comment magic")
+OrderSendResult = namedtuple("OrderSendResult", "retcode deal order volume price bid ask comment request_id request")
+
+# ----------------------------------------------------------------------
+# Configuration
+# ----------------------------------------------------------------------
+_MAJORS = ["EURUSD", "GBPUSD", "USDJPY", "USDCHF", "AUDUSD", "USDCAD", "NZDUSD", "EURGBP", "EURJPY", "XAUUSD"]
+
+
+def _symbol_names() -> List[str]:
+    raw = os.environ.get("FAKE_MT5_SYMBOLS")
+    names = [s.strip() for s in raw.split(",") if s.strip()] if raw else list(_MAJORS)
+    n = int(os.environ.get("FAKE_MT5_N_SYMBOLS", "0") or 0)
+    i = 0
+    while len(names) < n:
+        names.append(f"SYN{i:03d}")
+        i += 1
+    return names
+
+
+TICK_MS = max(1, int(os.environ.get("FAKE_MT5_TICK_MS", "250")))
+LATENCY_S = float(os.environ.get("FAKE_MT5_LATENCY_MS", "0")) / 1000.0
+FILLING_MODE = int(os.environ.get("FAKE_MT5_FILLING_MODE", str(SYMBOL_FILLING_FOK | SYMBOL_FILLING_IOC)))
+CONTRACT_SIZE = 100_000.0
+
+_SYMBOLS: Dict[str, SymbolInfo] = {}
+for _name in _symbol_names():
+    _jpy = "JPY" in _name
+    _SYMBOLS[_name] = SymbolInfo(
+        name=_name,
+        path=("Forex\\Majors\\" if _name in _MAJORS else "Synthetic\\") + _name,
+        description=f"Simulated {_name}",
+        digits=3 if _jpy else 5,
+        point=0.001 if _jpy else 0.00001,
+        spread=10,
+        filling_mode=FILLING_MODE,
+        visible=True,
+    )
+
+# ----------------------------------------------------------------------
+# Deterministic price model
+# ----------------------------------------------------------------------
+def _params(symbol: str):
+    h = zlib.crc32(symbol.encode("utf-8"))
+    base = 150.0 if "JPY" in symbol else (2000.0 if symbol.startswith("XAU") else 0.6 + (h % 1000) / 1000.0)
+    return base, (h % 6283) / 1000.0, h
+
+
+def _prices(symbol: str, k: np.ndarray) -> np.ndarray:
+    """Mid price at tick indexes ``k`` (int64 array)."""
+
+    base, phase, h = _params(symbol)
+    kf = k.astype(np.float64)
+    noise = (((k * 2654435761 + h) % 4294967296) / 4294967296.0) - 0.5
+    rel = (
+        0.004 * np.sin(kf / 40000.0 + phase)
+        + 0.0012 * np.sin(kf / 2500.0 + 2 * phase)
+        + 0.0003 * np.sin(kf / 90.0 + 3 * phase)
+        + 0.00008 * noise
+    )
+    return np.round(base * (1.0 + rel), 5)
+
+
+def _spread(symbol: str) -> float:
+    info = _SYMBOLS.get(symbol)
+    return (info.spread * info.point) if info else 0.0001
+
+
+# ----------------------------------------------------------------------
+# Terminal state
+# ----------------------------------------------------------------------
+_lock = threading.RLock()
+_state = {
+    "initialized": False,
+    "last_error": (1, "Success"),
+    "balance": 10_000.0,
+    # gateway workers (trader/core/mt5_pool.py) each simulate a terminal; keep their tickets apart
+    "next_ticket": 1_000_000 + int(os.environ.get("MT5_GATEWAY_WORKER", "0")) * 10_000_000,
+}
+_positions: Dict[int, dict] = {}
+_selected: set = set()
+
+
+def _latency() -> None:
+    if LATENCY_S > 0:
+        time.sleep(LATENCY_S)
+
+
+def _now_msc() -> int:
+    return int(time.time() * 1000)
+
+
+def _to_seconds(dt) -> int:
+    if isinstance(dt, datetime):
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp())
+    return int(dt)
+
+
+def _to_msc(dt) -> int:
+    if isinstance(dt, datetime):
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp() * 1000)
+    return int(dt) * 1000
+
+
+def _fail(code: int, msg: str):
+    _state["last_error"] = (code, msg)
+    return None
+
+
+# ----------------------------------------------------------------------
+# Connection
+# ----------------------------------------------------------------------
+def initialize(path: Optional[str] = None, **kwargs) -> bool:
+    _state["initialized"] = True
+    _state["last_error"] = (1, "Success")
+    return True
+
+
+def shutdown() -> None:
+    _state["initialized"] = False
+
+
+def last_error():
+    return _state["last_error"]
+
+
+def version():
+    return (500, 4000, "fake")
+
+
+def terminal_info():
+    if not _state["initialized"]:
+        return None
+    return TerminalInfo(True, True, "FakeMT5", "Simulation", "", 4000)
+
+
+# ----------------------------------------------------------------------
+# Symbols and prices
+# ----------------------------------------------------------------------
+def symbols_total() -> int:
+    return len(_SYMBOLS)
+
+
+def symbols_get(group: Optional[str] = None):
+    _latency()
+    return tuple(_SYMBOLS.values())
+
+
+def symbol_info(symbol: str):
+    _latency()
+    info = _SYMBOLS.get(symbol)
+    return info if info is not None else _fail(-1, f"Unknown symbol {symbol}")
+
+
+def symbol_select(symbol: str, enable: bool = True) -> bool:
+    _latency()
+    if symbol not in _SYMBOLS:
+        _fail(-1, f"Unknown symbol {symbol}")
+        return False
+    if enable:
+        _selected.add(symbol)
+    else:
+        _selected.discard(symbol)
+    return True
+
+
+def _ticks_between(symbol: str, from_msc: int, to_msc: int, count: Optional[int] = None) -> np.ndarray:
+    k0 = -(-from_msc // TICK_MS)
+    k1 = to_msc // TICK_MS
+    if count is not None:
+        k1 = min(k1, k0 + count - 1)
+    if k1 < k0:
+        return np.empty(0, dtype=TICKS_DTYPE)
+    k = np.arange(k0, k1 + 1, dtype=np.int64)
+    mid = _prices(symbol, k)
+    half = _spread(symbol) / 2.0
+    out = np.zeros(len(k), dtype=TICKS_DTYPE)
+    out["time_msc"] = k * TICK_MS
+    out["time"] = out["time_msc"] // 1000
+    out["bid"] = np.round(mid - half, 5)
+    out["ask"] = np.round(mid + half, 5)
+    out["flags"] = 6  # bid|ask changed
+    return out
+
+
+def symbol_info_tick(symbol: str):
+    _latency()
+    if symbol not in _SYMBOLS:
+        return _fail(-1, f"Unknown symbol {symbol}")
+    t = _ticks_between(symbol, _now_msc() - TICK_MS, _now_msc())[-1]
+    return Tick(int(t["time"]), float(t["bid"]), float(t["ask"]), 0.0, 0, int(t["time_msc"]), int(t["flags"]), 0.0)
+
+
+def copy_ticks_from(symbol: str, date_from, count: int, flags: int = COPY_TICKS_ALL):
+    _latency()
+    if symbol not in _SYMBOLS:
+        return _fail(-1, f"Unknown symbol {symbol}")
+    return _ticks_between(symbol, _to_msc(date_from), _now_msc(), int(count))
+
+
+def copy_ticks_range(symbol: str, date_from, date_to, flags: int = COPY_TICKS_ALL):
+    _latency()
+    if symbol not in _SYMBOLS:
+        return _fail(-1, f"Unknown symbol {symbol}")
+    return _ticks_between(symbol, _to_msc(date_from), min(_to_msc(date_to), _now_msc()))
+
+
+_SAMPLES_PER_BAR = 32
+
+
+def _bars(symbol: str, step: int, first_open: int, n: int) -> np.ndarray:
+    """``n`` consecutive bars starting at ``first_open`` (seconds), the last one possibly forming."""
+
+    out = np.zeros(n, dtype=RATES_DTYPE)
+    if n <= 0:
+        return out
+    opens = first_open + np.arange(n, dtype=np.int64) * step
+    now_msc = _now_msc()
+    start_k = -(-(opens * 1000) // TICK_MS)
+    end_k = np.minimum((opens + step) * 1000 - 1, now_msc) // TICK_MS
+    end_k = np.maximum(end_k, start_k)
+    frac = np.linspace(0.0, 1.0, _SAMPLES_PER_BAR)
+    ks = (start_k[:, None] + np.round((end_k - start_k)[:, None] * frac[None, :])).astype(np.int64)
+    px = _prices(symbol, ks.ravel()).reshape(ks.shape)
+    out["time"] = opens
+    out["open"] = px[:, 0]
+    out["close"] = px[:, -1]
+    out["high"] = px.max(axis=1)
+    out["low"] = px.min(axis=1)
+    out["tick_volume"] = (end_k - start_k + 1).astype(np.uint64)
+    out["spread"] = _SYMBOLS[symbol].spread
+    return out
+
+
+def copy_rates_from_pos(symbol: str, timeframe: int, start_pos: int, count: int):
+    _latency()
+    step = _TF_SECONDS.get(timeframe)
+    if symbol not in _SYMBOLS or step is None:
+        return _fail(-2, "Invalid params")
+    last_open = (int(time.time()) // step) * step - int(start_pos) * step
+    return _bars(symbol, step, last_open - (int(count) - 1) * step, int(count))
+
+
+def copy_rates_from(symbol: str, timeframe: int, date_from, count: int):
+    _latency()
+    step = _TF_SECONDS.get(timeframe)
+    if symbol not in _SYMBOLS or step is None:
+        return _fail(-2, "Invalid params")
+    last_open = (min(_to_seconds(date_from), int(time.time())) // step) * step
+    return _bars(symbol, step, last_open - (int(count) - 1) * step, int(count))
+
+
+def copy_rates_range(symbol: str, timeframe: int, date_from, date_to):
+    _latency()
+    step = _TF_SECONDS.get(timeframe)
+    if symbol not in _SYMBOLS or step is None:
+        return _fail(-2, "Invalid params")
+    first = -(-_to_seconds(date_from) // step) * step
+    last = (min(_to_seconds(date_to), int(time.time())) // step) * step
+    return _bars(symbol, step, first, max(0, (last - first) // step + 1))
+
+
+# ----------------------------------------------------------------------
+# Account, positions, orders
+# ----------------------------------------------------------------------
+def _mark(pos: dict):
+    tick = symbol_info_tick(pos["symbol"])
+    px = tick.bid if pos["type"] == ORDER_TYPE_BUY else tick.ask
+    sign = 1.0 if pos["type"] == ORDER_TYPE_BUY else -1.0
+    profit = round((px - pos["price_open"]) * sign * pos["volume"] * CONTRACT_SIZE, 2)
+    return px, profit
+
+
+def positions_get(symbol: Optional[str] = None, ticket: Optional[int] = None, **kwargs):
+    _latency()
+    with _lock:
+        out = []
+        for p in _positions.values():
+            if symbol and p["symbol"] != symbol:
+                continue
+            if ticket and p["ticket"] != ticket:
+                continue
+            px, profit = _mark(p)
+            out.append(TradePosition(
+                p["ticket"], p["symbol"], p["type"], p["volume"], p["price_open"], px,
+                p["sl"], p["tp"], profit, p["time"], p["comment"], p["magic"],
+            ))
+        return tuple(out)
+
+
+def orders_get(symbol: Optional[str] = None, ticket: Optional[int] = None, **kwargs):
+    _latency()
+    return ()  # only market orders are simulated; they fill immediately
+
+
+def account_info():
+    _latency()
+    with _lock:
+        profit = sum(_mark(p)[1] for p in _positions.values())
+        margin = sum(p["volume"] * CONTRACT_SIZE * p["price_open"] / 100.0 for p in _positions.values())
+        balance = _state["balance"]
+        return AccountInfo(
+            login=5000001, name="Simulated", server="FakeMT5-Demo", company="Simulation",
+            currency="USD", balance=round(balance, 2), equity=round(balance + profit, 2),
+            margin=round(margin, 2), margin_free=round(balance + profit - margin, 2),
+            profit=round(profit, 2), leverage=100,
+        )
+
+
+def order_send(request: dict):
+    _latency()
+    req = TradeRequest(
+        request.get("action"), request.get("symbol"), request.get("type"), float(request.get("volume", 0.0)),
+        float(request.get("price", 0.0)), float(request.get("sl", 0.0)), float(request.get("tp", 0.0)),
+        int(request.get("deviation", 0)), int(request.get("type_filling", 0)),
+        request.get("comment", ""), int(request.get("magic", 0)),
+    )
+
+    def result(retcode: int, comment: str, deal: int = 0, order: int = 0, price: float = 0.0):
+        return OrderSendResult(retcode, deal, order, req.volume, price, 0.0, 0.0, comment, 0, req)
+
+    if req.symbol not in _SYMBOLS:
+        return result(10013, "Invalid request")
+    allowed = {ORDER_FILLING_FOK: SYMBOL_FILLING_FOK, ORDER_FILLING_IOC: SYMBOL_FILLING_IOC}
+    flag = allowed.get(req.type_filling)
+    if flag is not None and not (FILLING_MODE & flag):
+        return result(TRADE_RETCODE_INVALID_FILL, "Unsupported filling mode")
+    if req.volume <= 0:
+        return result(TRADE_RETCODE_INVALID_VOLUME, "Invalid volume")
+
+    tick = symbol_info_tick(req.symbol)
+    price = tick.ask if req.type == ORDER_TYPE_BUY else tick.bid
+    with _lock:
+        ticket = _state["next_ticket"]
+        _state["next_ticket"] += 1
+        position = request.get("position")
+        if position and position in _positions:
+            # closing deal: realise the profit of the referenced position
+            _state["balance"] += _mark(_positions.pop(position))[1]
+        else:
+            _positions[ticket] = {
+                "ticket": ticket, "symbol": req.symbol, "type": req.type, "volume": req.volume,
+                "price_open": price, "sl": req.sl, "tp": req.tp, "time": int(time.time()),
+                "comment": req.comment, "magic": req.magic,
+            }
+    return result(TRADE_RETCODE_DONE, "Request executed", deal=ticket, order=ticket, price=price)
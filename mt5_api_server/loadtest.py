@@ -0,0 +1,241 @@
+"""Load-test harness for server.py.
+
+Drives the hot endpoints concurrently for a fixed duration and reports
+throughput plus p50/p99 latency per scenario:
+
+* ``candles``     GET  /candles/{symbol}
+* ``indicators``  POST /indicators/run
+* ``orders``      POST /orders/market
+* ``stream``      concurrent /stream/candles websockets (connect time, message
+                  rate and inter-message gap)
+
+Run against a live server, or let the harness start one on the simulator::
+
+    python loadtest.py --base http://127.0.0.1:8000 --duration 20
+    python loadtest.py --spawn --symbols 50 --ws-clients 200
+
+``--spawn`` launches ``uvicorn server:app`` with ``MT5_BACKEND=fake`` (see
+fake_mt5.py), so before/after numbers are reproducible on any machine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import requests
+import websockets
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Stats:
+    """Latency samples and error count for one scenario (thread-safe)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.samples: List[float] = []
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            if ok:
+                self.samples.append(seconds)
+            else:
+                self.errors += 1
+
+    def row(self, elapsed: float, unit: str = "req") -> str:
+        n = len(self.samples)
+        if n:
+            p50, p99 = np.percentile(np.asarray(self.samples) * 1000.0, [50, 99])
+        else:
+            p50 = p99 = float("nan")
+        return f"{self.name:<18} {n:>9} {unit:<4} {n / elapsed:>10.1f}/s   p50 {p50:>8.2f} ms   p99 {p99:>8.2f} ms   errors {self.errors}"
+
+
+# ----------------------------------------------------------------------
+# HTTP scenarios
+# ----------------------------------------------------------------------
+def _http_worker(stop: threading.Event, stats: Stats, call: Callable[[requests.Session, int], requests.Response]):
+    session = requests.Session()
+    i = 0
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            ok = call(session, i).status_code < 400
+        except requests.RequestException:
+            ok = False
+        stats.add(time.perf_counter() - t0, ok)
+        i += 1
+    session.close()
+
+
+def http_scenarios(args, symbols: List[str]) -> Dict[str, Callable[[requests.Session, int], requests.Response]]:
+    base = args.base.rstrip("/")
+
+    def candles(s: requests.Session, i: int):
+        return s.get(f"{base}/candles/{symbols[i % len(symbols)]}",
+                     params={"timeframe": args.timeframe, "limit": args.limit, "format": args.candle_format},
+                     timeout=30)
+
+    def indicators(s: requests.Session, i: int):
+        return s.post(f"{base}/indicators/run",
+                      json={"symbol": symbols[i % len(symbols)], "timeframe": args.timeframe}, timeout=30)
+
+    def orders(s: requests.Session, i: int):
+        return s.post(f"{base}/orders/market",
+                      json={"symbol": symbols[i % len(symbols)], "side": "buy" if i % 2 else "sell",
+                            "volume": 0.01, "comment": "loadtest"}, timeout=30)
+
+    return {"candles": candles, "indicators": indicators, "orders": orders}
+
+
+# ----------------------------------------------------------------------
+# WebSocket scenario
+# ----------------------------------------------------------------------
+async def _ws_client(url: str, deadline: float, connect: Stats, gaps: Stats, counter: List[int]) -> None:
+    t0 = time.perf_counter()
+    try:
+        async with websockets.connect(url, open_timeout=30, max_queue=None) as ws:
+            connect.add(time.perf_counter() - t0)
+            last = None
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    return
+                now = time.perf_counter()
+                if json.loads(raw).get("type") == "error":
+                    connect.add(0.0, ok=False)
+                    return
+                counter[0] += 1
+                if last is not None:
+                    gaps.add(now - last)
+                last = now
+    except Exception:
+        connect.add(0.0, ok=False)
+
+
+async def _ws_run(args, symbols: List[str], duration: float, connect: Stats, gaps: Stats, counter: List[int]):
+    ws_base = args.base.rstrip("/").replace("http://", "ws://").replace("https://", "wss://")
+    deadline = time.perf_counter() + duration
+    tasks = [
+        _ws_client(f"{ws_base}/stream/candles?symbol={symbols[i % len(symbols)]}&timeframe={args.timeframe}",
+                   deadline, connect, gaps, counter)
+        for i in range(args.ws_clients)
+    ]
+    await asyncio.gather(*tasks)
+
+
+# ----------------------------------------------------------------------
+# Spawned server
+# ----------------------------------------------------------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(args) -> subprocess.Popen:
+    port = _free_port()
+    env = dict(os.environ, MT5_BACKEND="fake")
+    if args.symbols:
+        env.setdefault("FAKE_MT5_N_SYMBOLS", str(args.symbols))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BASE_DIR, env=env,
+    )
+    args.base = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{args.base}/health", timeout=1).ok:
+                return proc
+        except requests.RequestException:
+            time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit("spawned server did not become healthy")
+
+
+def pick_symbols(args) -> List[str]:
+    r = requests.get(f"{args.base.rstrip('/')}/symbols", params={"limit": max(1, args.symbols or 10)}, timeout=30)
+    r.raise_for_status()
+    names = [it["name"] for it in r.json().get("symbols", [])]
+    if not names:
+        raise SystemExit("server returned no symbols")
+    return names
+
+
+# ----------------------------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Load-test the MT5 API server")
+    p.add_argument("--base", default="http://127.0.0.1:8000")
+    p.add_argument("--spawn", action="store_true", help="start server.py on the fake MT5 backend")
+    p.add_argument("--duration", type=float, default=15.0, help="seconds to run")
+    p.add_argument("--concurrency", type=int, default=8, help="HTTP workers per scenario")
+    p.add_argument("--ws-clients", type=int, default=50)
+    p.add_argument("--symbols", type=int, default=10, help="number of symbols to spread load over")
+    p.add_argument("--timeframe", default="M1")
+    p.add_argument("--limit", type=int, default=500, help="bars per /candles request")
+    p.add_argument("--candle-format", default="rows", choices=("rows", "columns", "binary"))
+    p.add_argument("--scenarios", default="candles,indicators,orders,stream",
+                   help="comma separated subset of candles,indicators,orders,stream")
+    args = p.parse_args(argv)
+
+    proc = spawn_server(args) if args.spawn else None
+    try:
+        symbols = pick_symbols(args)
+        wanted = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+        calls = http_scenarios(args, symbols)
+
+        stop = threading.Event()
+        stats: Dict[str, Stats] = {}
+        pool = ThreadPoolExecutor(max_workers=max(1, args.concurrency * len(calls)))
+        for name in wanted:
+            if name in calls:
+                stats[name] = Stats(name)
+                for _ in range(args.concurrency):
+                    pool.submit(_http_worker, stop, stats[name], calls[name])
+
+        connect, gaps, counter = Stats("ws connect"), Stats("ws msg gap"), [0]
+        t0 = time.perf_counter()
+        if "stream" in wanted and args.ws_clients > 0:
+            asyncio.run(_ws_run(args, symbols, args.duration, connect, gaps, counter))
+        else:
+            time.sleep(args.duration)
+        stop.set()
+        pool.shutdown(wait=True)
+        elapsed = time.perf_counter() - t0
+
+        print(f"{args.base}  {elapsed:.1f}s  symbols={len(symbols)} concurrency={args.concurrency} "
+              f"ws_clients={args.ws_clients if 'stream' in wanted else 0}")
+        for s in stats.values():
+            print(s.row(elapsed))
+        if "stream" in wanted and args.ws_clients > 0:
+            print(connect.row(elapsed, "conn"))
+            print(gaps.row(elapsed, "msg"))
+            print(f"{'ws messages':<18} {counter[0]:>9} msg  {counter[0] / elapsed:>10.1f}/s")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,20 +4,41 @@ from datetime import datetime, timezone, timedelta
 import time
 from fastapi import WebSocket, WebSocketDisconnect
 import asyncio
+import bisect
 from datetime import datetime, timedelta, timezone
 import json
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import threading
 import time
-from typing import Any, Dict, List, Optional, Literal
+from typing import Any, Dict, List, Optional, Literal, Tuple
 
-from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
-import MetaTrader5 as mt5
+import numpy as np
 import yaml
-
+from loguru import logger
+
+# MT5_BACKEND=fake swaps in the deterministic simulator (fake_mt5.py) for
+# running and load-testing the API without a terminal.
+if os.environ.get("MT5_BACKEND", "").lower() == "fake":
+    import fake_mt5 as mt5
+else:
+    import MetaTrader5 as mt5
+
+from trader.core import indicators as ind
+from trader.core.bars import CANDLE_DTYPE, CANDLE_MEDIA_TYPE, TF_SECONDS, BarRing, rates_to_candles
+from trader.core.indicator_jobs import IndicatorJobProcessor
+from trader.core.metrics import REGISTRY
+from trader.core.mt5_io import MT5Executor
+from trader.core.mt5_pool import MT5GatewayPool
 from trader.core.selection import StrategySelectionStore
+from trader.core.signal_store import SignalStore
+from trader.core.tick_store import TICK_DTYPE, TICK_MEDIA_TYPE, TickReader, TickRecorder
 
 
 # -------------------------
@@ -41,8 +62,7 @@ app.add_middleware(
 BASE_DIR = Path(__file__).resolve().parent
 TRADER_DIR = BASE_DIR / "trader"
 LOG_DIR = TRADER_DIR / "logs"
-SIGNAL_STATE_PATH = LOG_DIR / "signals_state.json"
-LEVELS_PATH = LOG_DIR / "levels.json"
+SIGNALS_DB_PATH = LOG_DIR / "signals.db"
 SELECTION_PATH = LOG_DIR / "strategy_selection.json"
 CONFIG_PATH = TRADER_DIR / "config.yaml"
 
@@ -58,35 +78,151 @@ def _read_json(path: Path) -> Dict[str, Any]:
         return {}
 
 
-def _load_trader_config() -> Dict[str, Any]:
-    if CONFIG_PATH.exists():
+def _read_yaml(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    except Exception:
+        return {}
+
+
+class CachedFile:
+    """
+    Parse-once view of a file that is rewritten by another process.
+
+    The parsed payload is reused until the file's (mtime_ns, size) changes,
+    which also serves as its weak ETag.  Callers must treat ``data`` as
+    read-only.
+    """
+
+    def __init__(self, path: Path, loader):
+        self.path = path
+        self.loader = loader
+        self.version: Optional[Tuple[int, int]] = None
+        self.data: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _stat(self) -> Tuple[int, int]:
         try:
-            return yaml.safe_load(CONFIG_PATH.read_text(encoding="utf-8")) or {}
-        except Exception:
-            return {}
-    return {}
+            st = self.path.stat()
+        except OSError:
+            return (0, 0)
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self) -> "CachedFile":
+        version = self._stat()
+        if version != self.version:
+            with self._lock:
+                if version != self.version:
+                    data = self.loader(self.path)
+                    self.data = data
+                    self.version = version
+        return self
+
+    @property
+    def etag(self) -> str:
+        mtime, size = self.version or (0, 0)
+        return f"{mtime:x}-{size:x}"
+
+
+# written by the trader's SignalLogger (WAL mode, so reads never block it)
+signal_store = SignalStore(SIGNALS_DB_PATH)
+selection_file = CachedFile(SELECTION_PATH, _read_json)
+config_file = CachedFile(CONFIG_PATH, _read_yaml)
+
+
+def _load_trader_config() -> Dict[str, Any]:
+    return config_file.load().data
 
 
 def _load_selection() -> List[str]:
-    data = _read_json(SELECTION_PATH)
+    data = selection_file.load().data
     return [str(x) for x in data.get("strategies", [])]
 
 
+def _etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip().removeprefix("W/").strip('"') for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def _conditional(etag: str, if_none_match: Optional[str], build) -> Response:
+    """Answer 304 when the client already holds ``etag``; else JSON from ``build()``."""
+    headers = {"ETag": f'W/"{etag}"', "Cache-Control": "no-cache"}
+    if _etag_matches(etag, if_none_match):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(build(), headers=headers)
+
+
+# -------------------------
+# Metrics (exposed on /metrics)
+# -------------------------
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status"),
+)
+MT5_LATENCY = REGISTRY.histogram("mt5_call_duration_seconds", "MT5 call latency by function", ("call",))
+TICKS_PER_POLL = REGISTRY.histogram(
+    "mt5_ticks_per_poll", "Ticks returned per copy_ticks_from poll", ("symbol",),
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 1000, 4096),
+)
+WS_SENT = REGISTRY.counter("ws_messages_sent_total", "WebSocket messages (stream updates) sent, batched or not")
+WS_FRAMES = REGISTRY.counter("ws_frames_sent_total", "WebSocket frames written (one batch frame carries many messages)")
+WS_SEND_FAILURES = REGISTRY.counter("ws_send_failures_total", "WebSocket sends that failed")
+WS_DROPPED = REGISTRY.counter("ws_messages_dropped_total", "Queued WebSocket messages superseded or dropped")
+ORDER_RETCODES = REGISTRY.counter("mt5_order_retcode_total", "order_send results by retcode", ("retcode",))
+STREAM_POLL_ERRORS = REGISTRY.counter("stream_poll_errors_total", "Failed tick polls by symbol", ("symbol",))
+
+
+@app.middleware("http")
+async def _observe_latency(request: Request, call_next):
+    t0 = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_LATENCY.observe(
+            time.perf_counter() - t0,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status,
+        )
+
+
 # -------------------------
 # MT5 startup / shutdown
 # -------------------------
+# With `mt5_gateway.terminals` in config.yaml every terminal gets its own gateway
+# process and calls are routed by symbol (trader/core/mt5_pool.py); otherwise
+# every MT5 call goes through one dedicated thread (trader/core/mt5_io.py).
+MT5_TERMINALS: List[Optional[str]] = list((_load_trader_config().get("mt5_gateway") or {}).get("terminals") or [])
+mt5_gateway: Optional[MT5GatewayPool] = MT5GatewayPool(mt5, MT5_TERMINALS) if MT5_TERMINALS else None
+mt5io = MT5Executor(
+    mt5_gateway or mt5,
+    observe=lambda name, dt: MT5_LATENCY.observe(dt, call=name),
+    max_workers=2 * len(MT5_TERMINALS) if MT5_TERMINALS else 1,
+)
+REGISTRY.gauge("mt5_calls_coalesced", "MT5 reads answered by an in-flight identical call", lambda: mt5io.coalesced)
+
+
 def _mt5_init_once() -> None:
     """Initialize MT5 terminal if not already connected."""
-    if mt5.initialize():
+    ok, err = mt5io.call_with_error("initialize")
+    if ok:
         return
     # Try without path; fall back to env var META_TRADER5_PATH if provided
     path = os.environ.get("META_TRADER5_PATH")
     if path:
-        if not mt5.initialize(path):
-            raise RuntimeError(f"MT5 initialize failed: {mt5.last_error()}")
+        ok, err = mt5io.call_with_error("initialize", path)
+        if not ok:
+            raise RuntimeError(f"MT5 initialize failed: {err}")
     else:
         # If still not initialized, raise a clear error
-        raise RuntimeError(f"MT5 initialize failed: {mt5.last_error()}")
+        raise RuntimeError(f"MT5 initialize failed: {err}")
 
 
 @app.on_event("startup")
@@ -97,9 +233,16 @@ def _on_startup():
 @app.on_event("shutdown")
 def _on_shutdown():
     try:
-        mt5.shutdown()
+        mt5io.call("shutdown")
     except Exception:
         pass
+    mt5io.shutdown()
+    if mt5_gateway is not None:
+        mt5_gateway.close()
+    if tick_writer is not None:
+        tick_writer.shutdown(wait=True)  # let queued appends land before the segments close
+    if tick_recorder is not None:
+        tick_recorder.close()
 
 
 # -------------------------
@@ -222,6 +365,102 @@ TF_MAP: Dict[str, int] = {
     "MN1": mt5.TIMEFRAME_MN1,
 }
 
+TF_SECONDS_BY_TF: Dict[int, int] = {TF_MAP[k]: v for k, v in TF_SECONDS.items()}
+
+
+# -------------------------
+# Candle cache
+# -------------------------
+class CandleCache:
+    """
+    Per-(symbol, timeframe) bar cache backed by ``BarRing`` buffers.
+
+    The first request for a key copies ``limit`` bars from MT5; afterwards each
+    request only fetches the few bars newer than the cached high-water mark and
+    merges them in, and any ``limit`` is served as a slice of the buffer.
+    Buffers are evicted least-recently-used once their total size exceeds
+    ``budget_bytes``.
+
+    MT5 I/O for a key runs under that key's lock only; the cache-wide lock
+    just guards the dict / LRU order, so reads of different symbols (and
+    shards, with the gateway pool) proceed in parallel.
+    """
+
+    def __init__(self, budget_bytes: int, max_bars: int = 10000):
+        self.budget_bytes = int(budget_bytes)
+        self.max_bars = int(max_bars)
+        self._rings: "OrderedDict[Tuple[str, int], BarRing]" = OrderedDict()
+        self._complete: set[Tuple[str, int]] = set()  # keys where MT5 has no older history
+        self._key_locks: Dict[Tuple[str, int], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _evict(self) -> None:
+        total = sum(r.nbytes for r in self._rings.values())
+        while total > self.budget_bytes and len(self._rings) > 1:
+            key, ring = self._rings.popitem(last=False)
+            self._complete.discard(key)
+            total -= ring.nbytes
+
+    def _install(self, key: Tuple[str, int], ring: BarRing, complete: Optional[bool] = None) -> None:
+        with self._lock:
+            self._rings[key] = ring
+            self._rings.move_to_end(key)
+            if complete is not None:
+                if complete:
+                    self._complete.add(key)
+                else:
+                    self._complete.discard(key)
+            self._evict()
+
+    def _reload(self, symbol: str, tf: int, limit: int, old: Optional[BarRing]) -> Optional[BarRing]:
+        rates = mt5io.copy_rates_from_pos(symbol, tf, 0, limit)
+        if rates is None or len(rates) == 0:
+            return None
+        capacity = max(limit, old.capacity if old is not None else 0)
+        ring = old if old is not None and old.capacity >= capacity else BarRing(capacity, rates.dtype)
+        ring.clear()
+        ring.extend(rates)
+        self._install((symbol, tf), ring, complete=len(rates) < limit)
+        return ring
+
+    def _refresh(self, symbol: str, tf: int, ring: BarRing) -> Optional[BarRing]:
+        step = TF_SECONDS_BY_TF.get(tf, 60)
+        # Bars since the high-water mark by wall clock; broker time offsets and
+        # session gaps only make this a guess, so widen until the fetch overlaps.
+        count = max(2, (int(time.time()) - ring.last_time) // step + 2)
+        while True:
+            count = min(count, ring.capacity)
+            rates = mt5io.copy_rates_from_pos(symbol, tf, 0, count)
+            if rates is None or len(rates) == 0:
+                break
+            if ring.merge(rates):
+                break
+            if count >= ring.capacity:
+                return self._reload(symbol, tf, ring.capacity, ring)
+            count *= 4
+        self._install((symbol, tf), ring)
+        return ring
+
+    def get(self, symbol: str, tf: int, limit: int) -> Optional[np.ndarray]:
+        """Return up to ``limit`` newest bars (ascending) as a structured array."""
+        key = (symbol, tf)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                ring = self._rings.get(key)
+                complete = key in self._complete
+            if ring is None or (len(ring) < limit and not complete):
+                ring = self._reload(symbol, tf, min(limit, self.max_bars), ring)
+            else:
+                ring = self._refresh(symbol, tf, ring)
+            if ring is None:
+                return None
+            return ring.view(limit).copy()
+
+
+candle_cache = CandleCache(budget_bytes=int(float(os.environ.get("CANDLE_CACHE_MB", "64")) * 1024 * 1024))
+
 
 # -------------------------
 # Pydantic models
@@ -242,6 +481,10 @@ class MarketOrderReq(BaseModel):
     filling: Optional[int] = None
 
 
+class MarketOrderBatchReq(BaseModel):
+    orders: List[MarketOrderReq] = Field(..., min_length=1, max_length=500)
+
+
 class StrategySelectionRequest(BaseModel):
     strategies: List[str]
 
@@ -254,47 +497,199 @@ class IndicatorReq(BaseModel):
     macd_fast: int = 12
     macd_slow: int = 26
     macd_signal: int = 9
+    series: bool = False  # also return the full indicator series
+
+
+class IndicatorSpec(BaseModel):
+    name: str = Field(..., examples=["RSI", "EMA", "MACD"])
+    period: Optional[int] = Field(None, ge=1)
+    fast: Optional[int] = Field(None, ge=1)
+    slow: Optional[int] = Field(None, ge=1)
+    signal: Optional[int] = Field(None, ge=1)
+
+
+class IndicatorBatchReq(BaseModel):
+    symbols: List[str] = Field(..., min_length=1)
+    timeframes: List[str] = Field(default_factory=lambda: ["M30"], min_length=1)
+    lookback: int = Field(300, ge=1, le=10000)
+    indicators: List[IndicatorSpec] = Field(..., min_length=1)
+    series: bool = False  # full series over ``lookback`` bars instead of last values
 
 
 # -------------------------
 # Public API
 # -------------------------
+@app.get("/metrics")
+def metrics():
+    """Prometheus text exposition of the server's counters and histograms."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 def health():
-    return {"ok": True, "mt5_connected": bool(mt5.terminal_info())}
+    out = {"ok": True, "mt5_connected": bool(mt5io.terminal_info())}
+    if mt5_gateway is not None:
+        out["gateway"] = mt5_gateway.stats()
+    return out
 
 
 @app.get("/account")
 def account():
+    if account_snapshot.fresh and account_snapshot.account is not None:
+        return account_snapshot.account
     _mt5_init_once()
-    ai = mt5.account_info()
+    ai, err = mt5io.call_with_error("account_info")
     if ai is None:
-        raise HTTPException(500, f"account_info failed: {mt5.last_error()}")
+        raise HTTPException(500, f"account_info failed: {err}")
     return _account_to_dict(ai)
 
 
+class SymbolCatalog:
+    """
+    In-memory symbol list with a search index, refreshed from MT5 periodically.
+
+    Names are kept sorted (lower-case) for O(log n) prefix lookups, and name,
+    path and description are joined into one lower-case blob so substring
+    search runs as repeated ``str.find`` in C rather than a Python loop.
+    """
+
+    def __init__(self):
+        self.items: List[Dict[str, str]] = []
+        self.groups: Dict[str, int] = {}
+        self.loaded_at = 0.0
+        self._names: List[Tuple[str, int]] = []
+        self._blob = ""
+        self._offsets: List[int] = []
+
+    def refresh(self) -> None:
+        all_syms = mt5io.symbols_get() or ()
+        items = [
+            {
+                "name": getattr(s, "name", ""),
+                "path": getattr(s, "path", ""),
+                "description": getattr(s, "description", getattr(s, "name", "")),
+            }
+            for s in all_syms
+        ]
+        groups: Dict[str, int] = {}
+        haystacks: List[str] = []
+        offsets: List[int] = []
+        pos = 0
+        for it in items:
+            path = it["path"].replace("/", "\\")
+            parts = path.split("\\")[:-1]
+            for i in range(1, len(parts) + 1):
+                g = "\\".join(parts[:i])
+                groups[g] = groups.get(g, 0) + 1
+            hay = f"{it['name']}\t{it['path']}\t{it['description']}".lower()
+            offsets.append(pos)
+            haystacks.append(hay)
+            pos += len(hay) + 1
+        # swap in atomically so readers never see a half-built index
+        self._names, self._blob, self._offsets = (
+            sorted((it["name"].lower(), i) for i, it in enumerate(items)),
+            "\n".join(haystacks),
+            offsets,
+        )
+        self.items, self.groups, self.loaded_at = items, groups, time.time()
+
+    def search(self, q: str = "", group: Optional[str] = None) -> List[int]:
+        """Return matching item indexes: name-prefix hits first, then other substring hits."""
+        items, names, blob, offsets = self.items, self._names, self._blob, self._offsets
+        q = q.strip().lower()
+        if not q:
+            hits = list(range(len(items)))
+        else:
+            lo = bisect.bisect_left(names, (q, -1))
+            prefix: List[int] = []
+            for name, i in names[lo:]:
+                if not name.startswith(q):
+                    break
+                prefix.append(i)
+            seen = set(prefix)
+            rest: List[int] = []
+            start = blob.find(q)
+            while start != -1:
+                i = bisect.bisect_right(offsets, start) - 1
+                if i not in seen:
+                    seen.add(i)
+                    rest.append(i)
+                # skip to the next symbol's text
+                nxt = offsets[i + 1] if i + 1 < len(offsets) else len(blob)
+                start = blob.find(q, nxt)
+            hits = prefix + rest
+        if group:
+            g = group.replace("/", "\\").strip("\\").lower() + "\\"
+            hits = [i for i in hits if items[i]["path"].replace("/", "\\").lower().startswith(g)]
+        return hits
+
+
+symbol_catalog = SymbolCatalog()
+SYMBOLS_REFRESH_S = float(os.environ.get("SYMBOLS_REFRESH_S", "300"))
+
+
+async def _refresh_symbols_forever():
+    while True:
+        await asyncio.sleep(SYMBOLS_REFRESH_S)
+        try:
+            await asyncio.to_thread(symbol_catalog.refresh)
+        except Exception:
+            pass
+
+
+@app.on_event("startup")
+async def _start_symbol_catalog():
+    try:
+        await asyncio.to_thread(symbol_catalog.refresh)
+    except Exception:
+        pass
+    asyncio.create_task(_refresh_symbols_forever())
+
+
 @app.get("/symbols")
-def symbols(limit: int = 200):
-    """Return a list of tradeable symbols (name + description)."""
-    res = []
-    all_syms = mt5.symbols_get()
-    if not all_syms:
-        return {"symbols": res}
-
-    for s in all_syms:
-        res.append({
-            "name": getattr(s, "name", ""),
-            "path": getattr(s, "path", ""),
-            "description": getattr(s, "description", getattr(s, "name", "")),
-        })
-        if len(res) >= limit:
-            break
-    return {"symbols": res}
+def symbols(
+    limit: int = Query(200, ge=1, le=5000),
+    q: str = "",
+    group: Optional[str] = None,
+    cursor: Optional[str] = None,
+):
+    """
+    Search the cached symbol catalog (name, path, description).
+
+    Name-prefix matches rank first.  ``group`` restricts results to a path
+    group such as ``Forex\\Majors``; pass ``next_cursor`` back as ``cursor``
+    to fetch the next page.
+    """
+    if not symbol_catalog.loaded_at:
+        symbol_catalog.refresh()
+    try:
+        offset = max(int(cursor), 0) if cursor else 0
+    except ValueError:
+        raise HTTPException(422, "invalid cursor")
+    items = symbol_catalog.items
+    hits = symbol_catalog.search(q, group)
+    page = [items[i] for i in hits[offset:offset + limit]]
+    nxt = offset + limit
+    return {
+        "symbols": page,
+        "total": len(hits),
+        "next_cursor": str(nxt) if nxt < len(hits) else None,
+    }
+
+
+@app.get("/symbols/groups")
+def symbol_groups():
+    """Path groups of the symbol catalog with their symbol counts."""
+    if not symbol_catalog.loaded_at:
+        symbol_catalog.refresh()
+    return {"groups": [{"path": g, "count": n} for g, n in sorted(symbol_catalog.groups.items())]}
 
 
 @app.get("/positions")
 def positions():
-    pos = mt5.positions_get()
+    if account_snapshot.fresh:
+        return {"positions": list(account_snapshot.positions.values())}
+    pos = mt5io.positions_get()
     if pos is None:
         return {"positions": []}
     return {"positions": [_position_to_dict(p) for p in pos]}
@@ -302,47 +697,178 @@ def positions():
 
 @app.get("/orders")
 def orders():
-    ords = mt5.orders_get()
+    if account_snapshot.fresh:
+        return {"orders": list(account_snapshot.orders.values())}
+    ords = mt5io.orders_get()
     if ords is None:
         return {"orders": []}
     return {"orders": [_order_to_dict(o) for o in ords]}
 
 
+CandleFormat = Literal["rows", "columns", "binary"]
+
+
+def _candle_format(fmt: Optional[str], accept: Optional[str]) -> CandleFormat:
+    """Pick the /candles encoding from ``format=`` or, failing that, the Accept header."""
+    if fmt:
+        fmt = fmt.lower()
+        if fmt not in ("rows", "columns", "binary"):
+            raise HTTPException(422, "format must be 'rows', 'columns' or 'binary'")
+        return fmt  # type: ignore[return-value]
+    accept = (accept or "").lower()
+    if CANDLE_MEDIA_TYPE in accept or "application/octet-stream" in accept:
+        return "binary"
+    if "columns" in accept:
+        return "columns"
+    return "rows"
+
+
+def _candle_columns(packed: np.ndarray) -> Dict[str, List[Any]]:
+    return {name: packed[name].tolist() for name in CANDLE_DTYPE.names}
+
+
 @app.get("/candles/{symbol}")
-def candles(symbol: str, timeframe: str = Query("M1"), limit: int = Query(1000, ge=1, le=10000)):
+def candles(
+    symbol: str,
+    timeframe: str = Query("M1"),
+    limit: int = Query(1000, ge=1, le=10000),
+    format: Optional[str] = Query(None),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Return the newest ``limit`` bars.
+
+    ``format=rows`` (default) returns a list of bar dicts, ``format=columns``
+    parallel arrays (``time[]``, ``open[]``, ...) and ``format=binary`` packed
+    little-endian ``CANDLE_DTYPE`` records that load with ``numpy.frombuffer``.
+    Without ``format`` the Accept header decides.
+    """
+    fmt = _candle_format(format, accept)
     tf = TF_MAP.get(timeframe.upper())
     if tf is None:
         raise HTTPException(422, "Unsupported timeframe")
-    if not mt5.symbol_select(symbol, True):
+    if not _ensure_selected(symbol):
         raise HTTPException(400, f"Cannot select symbol {symbol}")
 
-    rates = mt5.copy_rates_from_pos(symbol, tf, 0, limit)
+    rates = candle_cache.get(symbol, tf, limit)
     if rates is None or len(rates) == 0:
         raise HTTPException(500, "copy_rates_from_pos failed or returned empty")
 
-    out = [_rate_to_dict(r) for r in rates]
-    out.sort(key=lambda x: x["time"])  # ensure ascending
+    # cache keeps bars ascending; convert whole columns at once
+    packed = rates_to_candles(rates)
+    if fmt == "binary":
+        return Response(
+            content=packed.tobytes(),
+            media_type=CANDLE_MEDIA_TYPE,
+            headers={"X-Symbol": symbol, "X-Timeframe": timeframe, "X-Bar-Count": str(len(packed))},
+        )
+    cols = _candle_columns(packed)
+    if fmt == "columns":
+        return {"symbol": symbol, "timeframe": timeframe, "columns": cols}
+    names = CANDLE_DTYPE.names
+    out = [dict(zip(names, row)) for row in zip(*(cols[n] for n in names))]
     return {"symbol": symbol, "timeframe": timeframe, "candles": out}
 
 
+RANGE_CHUNK_BARS = 10000
+
+
+def _epoch_seconds(v: int) -> int:
+    """Accept epoch seconds or milliseconds."""
+    return v // 1000 if v >= 100_000_000_000 else v
+
+
+@app.get("/candles/{symbol}/range")
+def candles_range(
+    symbol: str,
+    timeframe: str = Query("M1"),
+    from_: int = Query(..., alias="from"),
+    to: Optional[int] = None,
+    format: Optional[str] = Query(None),
+    chunk: int = Query(RANGE_CHUNK_BARS, ge=100, le=100000),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Bars with open time in ``[from, to]`` (epoch seconds or ms; ``to`` defaults to now).
+
+    History is paged through ``copy_rates_range`` ``chunk`` bars at a time and
+    each page is written out as soon as it arrives, so neither side ever holds
+    the whole range.  ``format=ndjson`` (default) streams one bar object per
+    line; ``format=binary`` (or an Accept of ``CANDLE_MEDIA_TYPE``) streams
+    packed ``CANDLE_DTYPE`` records.
+    """
+    fmt = (format or ("binary" if _candle_format(None, accept) == "binary" else "ndjson")).lower()
+    if fmt not in ("ndjson", "binary"):
+        raise HTTPException(422, "format must be 'ndjson' or 'binary'")
+    tf = TF_MAP.get(timeframe.upper())
+    if tf is None:
+        raise HTTPException(422, "Unsupported timeframe")
+    lo = _epoch_seconds(from_)
+    hi = _epoch_seconds(to) if to is not None else int(time.time())
+    if hi < lo:
+        raise HTTPException(422, "'to' must not be before 'from'")
+    if not _ensure_selected(symbol):
+        raise HTTPException(400, f"Cannot select symbol {symbol}")
+    span = chunk * TF_SECONDS_BY_TF[tf]
+
+    def pages():
+        last = lo - 1
+        for start in range(lo, hi + 1, span):
+            end = min(start + span - 1, hi)
+            rates = mt5io.copy_rates_range(
+                symbol, tf,
+                datetime.fromtimestamp(start, tz=timezone.utc),
+                datetime.fromtimestamp(end, tz=timezone.utc),
+            )
+            if rates is None or len(rates) == 0:
+                continue  # market closed for the whole page
+            packed = rates_to_candles(rates)
+            packed = packed[(packed["time"] > last) & (packed["time"] <= hi)]
+            if len(packed):
+                last = int(packed["time"][-1])
+                yield packed
+
+    if fmt == "binary":
+        body = (p.tobytes() for p in pages())
+        media_type = CANDLE_MEDIA_TYPE
+    else:
+        names = CANDLE_DTYPE.names
+
+        def lines():
+            for p in pages():
+                cols = _candle_columns(p)
+                yield "".join(json.dumps(dict(zip(names, row))) + "\n" for row in zip(*(cols[n] for n in names)))
+
+        body = lines()
+        media_type = "application/x-ndjson"
+    return StreamingResponse(body, media_type=media_type, headers={"X-Symbol": symbol, "X-Timeframe": timeframe})
+
+
 @app.get("/strategy/catalog")
-def strategy_catalog():
-    cfg = _load_trader_config()
-    selection = set(_load_selection())
-    fallback_enabled = not selection
-    strategies = []
-    for name, params in (cfg.get("strategies") or {}).items():
-        strategies.append({
-            "name": name,
-            "params": params,
-            "enabled": fallback_enabled or name in selection,
-        })
-    return {"strategies": strategies}
+def strategy_catalog(if_none_match: Optional[str] = Header(None)):
+    cfg_file = config_file.load()
+    sel_file = selection_file.load()
+
+    def build():
+        cfg = cfg_file.data
+        selection = set(str(x) for x in sel_file.data.get("strategies", []))
+        fallback_enabled = not selection
+        strategies = []
+        for name, params in (cfg.get("strategies") or {}).items():
+            strategies.append({
+                "name": name,
+                "params": params,
+                "enabled": fallback_enabled or name in selection,
+            })
+        return {"strategies": strategies}
+
+    return _conditional(f"{cfg_file.etag}.{sel_file.etag}", if_none_match, build)
 
 
 @app.get("/strategy/selection")
-def get_strategy_selection():
-    return {"strategies": _load_selection()}
+def get_strategy_selection(if_none_match: Optional[str] = Header(None)):
+    sel_file = selection_file.load()
+    return _conditional(sel_file.etag, if_none_match, lambda: {"strategies": _load_selection()})
 
 
 @app.post("/strategy/selection")
@@ -353,84 +879,157 @@ def set_strategy_selection(req: StrategySelectionRequest):
 
 
 @app.get("/strategy/signals")
-def get_strategy_signals(limit: int = 200, status: Optional[str] = None):
-    data = _read_json(SIGNAL_STATE_PATH).get("signals", [])
-    if status:
-        data = [d for d in data if d.get("status") == status]
-    return {"signals": data[-limit:]}
+def get_strategy_signals(
+    limit: int = Query(200, ge=1, le=10000),
+    status: Optional[str] = None,
+    symbol: Optional[str] = None,
+    strategy: Optional[str] = None,
+    since: Optional[float] = Query(None, description="opened_at >= since (epoch seconds)"),
+    until: Optional[float] = Query(None, description="opened_at < until (epoch seconds)"),
+    if_none_match: Optional[str] = Header(None),
+):
+    etag = f"{signal_store.version():x}"
+    return _conditional(etag, if_none_match, lambda: {
+        "signals": signal_store.query(status=status, symbol=symbol, strategy=strategy,
+                                      since=since, until=until, limit=limit),
+    })
 
 
 @app.get("/strategy/levels")
-def get_strategy_levels(symbol: Optional[str] = None):
-    payload = _read_json(LEVELS_PATH)
-    levels = payload.get("levels", [])
-    if symbol:
-        levels = [lvl for lvl in levels if lvl.get("symbol") == symbol]
-    return {"levels": levels, "generated_at": payload.get("generated_at")}
+def get_strategy_levels(symbol: Optional[str] = None, if_none_match: Optional[str] = Header(None)):
+    etag = f"{signal_store.version():x}"
+
+    def build():
+        levels = [
+            {
+                "id": rec["id"],
+                "symbol": rec["symbol"],
+                "strategy": rec["strategy"],
+                "side": rec["side"],
+                "entry": rec["entry_price"],
+                "stop": rec["stop_loss"],
+                "target": rec["take_profit"],
+                "pivot": rec["pivot"],
+            }
+            for rec in signal_store.query(status="open", symbol=symbol, limit=None)
+        ]
+        return {"levels": levels, "generated_at": time.time()}
 
+    return _conditional(etag, if_none_match, build)
 
-@app.post("/indicators/run")
-def run_indicators(req: IndicatorReq):
-    tf = TF_MAP.get(req.timeframe.upper(), mt5.TIMEFRAME_M30)
-    if not mt5.symbol_select(req.symbol, True):
-        raise HTTPException(400, f"Cannot select {req.symbol}")
 
-    # Query the last N bars so indicators have data
-    bars = max(100, req.rsi_period + req.ema_period + req.macd_slow + 5)
-    rates = mt5.copy_rates_from_pos(req.symbol, tf, 0, bars)
+def _closes(symbol: str, timeframe: str, bars: int) -> np.ndarray:
+    tf = TF_MAP.get(timeframe.upper())
+    if tf is None:
+        raise HTTPException(422, f"Unsupported timeframe {timeframe}")
+    if not _ensure_selected(symbol):
+        raise HTTPException(400, f"Cannot select {symbol}")
+    rates = candle_cache.get(symbol, tf, min(bars, candle_cache.max_bars))
     if rates is None or len(rates) == 0:
         raise HTTPException(500, "No rates for indicators")
+    return rates["close"].astype(float)
 
-    closes = [float(_rate_field(r, "close")) for r in rates]
-
-    # Simple indicator calcs (pure python) to avoid handle issues:
-    def ema(arr: List[float], period: int) -> float:
-        if period <= 1:
-            return arr[-1]
-        alpha = 2.0 / (period + 1.0)
-        v = arr[0]
-        for x in arr[1:]:
-            v = alpha * x + (1 - alpha) * v
-        return v
 
-    def sma(arr: List[float], period: int) -> float:
-        return sum(arr[-period:]) / period
+@app.post("/indicators/run")
+def run_indicators(req: IndicatorReq):
+    # Query the last N bars so indicators have data
+    bars = max(100, req.rsi_period + req.ema_period + req.macd_slow + 5)
+    closes = _closes(req.symbol, req.timeframe, bars)
 
-    # RSI (classic Wilder)
-    def rsi(arr: List[float], period: int) -> float:
-        gains, losses = 0.0, 0.0
-        for i in range(-period, -1):
-            diff = arr[i + 1] - arr[i]
-            if diff >= 0:
-                gains += diff
-            else:
-                losses -= diff
-        if period > 0:
-            gains /= period
-            losses /= period
-        rs = gains / (losses if losses != 0 else 1e-12)
-        return 100.0 - (100.0 / (1.0 + rs))
-
-    # MACD(EMA fast - EMA slow), signal is EMA(signal)
-    macd_val = ema(closes, req.macd_fast) - ema(closes, req.macd_slow)
-    macd_signal = ema([ema(closes[:i], req.macd_fast) - ema(closes[:i], req.macd_slow)
-                       for i in range(1, len(closes) + 1)], req.macd_signal)
+    r = ind.rsi(closes, req.rsi_period)
+    e = ind.ema(closes, req.ema_period)
+    m = ind.macd(closes, req.macd_fast, req.macd_slow, req.macd_signal)
 
-    return {
+    out = {
         "symbol": req.symbol,
         "timeframe": req.timeframe,
-        "rsi": round(rsi(closes, req.rsi_period), 6),
-        "ema": round(ema(closes, req.ema_period), 6),
-        "macd": round(macd_val, 6),
-        "macd_signal": round(macd_signal, 6),
+        "rsi": round(float(r[-1]), 6),
+        "ema": round(float(e[-1]), 6),
+        "macd": round(float(m["macd"][-1]), 6),
+        "macd_signal": round(float(m["signal"][-1]), 6),
     }
+    if req.series:
+        out["series"] = ind.evaluate(
+            [
+                {"name": "RSI", "period": req.rsi_period},
+                {"name": "EMA", "period": req.ema_period},
+                {"name": "MACD", "fast": req.macd_fast, "slow": req.macd_slow, "signal": req.macd_signal},
+            ],
+            closes,
+            series=True,
+        )
+    return out
+
+
+@app.post("/indicators/batch")
+def run_indicators_batch(req: IndicatorBatchReq):
+    """Evaluate the same indicator specs for every symbol x timeframe pair."""
+    specs: List[Dict[str, Any]] = []
+    invalid: List[Dict[str, Any]] = []
+    for i, spec in enumerate(req.indicators):
+        try:
+            specs.append(ind.normalize(spec.model_dump(exclude_none=True)))
+        except ValueError as e:
+            invalid.append({"indicator": i, "error": str(e)})
+    if invalid:
+        raise HTTPException(422, invalid)
+    bars = max([req.lookback] + [ind.warmup(s) * 3 for s in specs])
+
+    results: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    for symbol in req.symbols:
+        for timeframe in req.timeframes:
+            try:
+                closes = _closes(symbol, timeframe, bars)
+            except HTTPException as e:
+                errors.append({"symbol": symbol, "timeframe": timeframe, "error": e.detail})
+                continue
+            results.append({
+                "symbol": symbol,
+                "timeframe": timeframe,
+                "indicators": ind.evaluate(specs, closes[-req.lookback:] if req.series else closes, series=req.series),
+            })
+    return {"results": results, "errors": errors}
+
+
+# File-queued indicator jobs (mt5_files/indicator_requests); see trader/core/indicator_jobs.py.
+# INDICATOR_JOBS=0 disables the watcher.
+INDICATOR_JOBS_DIR = Path(os.environ.get("INDICATOR_JOBS_DIR", str(BASE_DIR / "mt5_files" / "indicator_requests")))
+indicator_jobs: Optional[IndicatorJobProcessor] = None
+REGISTRY.gauge("indicator_jobs_processed", "Indicator job files answered",
+               lambda: indicator_jobs.processed if indicator_jobs else 0)
+REGISTRY.gauge("indicator_jobs_fetches", "Closes fetched for indicator jobs (after dedup)",
+               lambda: indicator_jobs.fetches if indicator_jobs else 0)
+
+
+def _job_closes(symbol: str, timeframe: str, bars: int) -> np.ndarray:
+    try:
+        return _closes(symbol, timeframe, bars)
+    except HTTPException as e:
+        raise RuntimeError(str(e.detail)) from None
+
+
+@app.on_event("startup")
+def _start_indicator_jobs():
+    global indicator_jobs
+    if os.environ.get("INDICATOR_JOBS", "1") == "0":
+        return
+    indicator_jobs = IndicatorJobProcessor(
+        INDICATOR_JOBS_DIR, _job_closes, workers=int(os.environ.get("INDICATOR_JOB_WORKERS", "4")),
+    ).start()
+
+
+@app.on_event("shutdown")
+def _stop_indicator_jobs():
+    if indicator_jobs is not None:
+        indicator_jobs.stop()
 
 
 # -------------------------
 # Order send utilities
 # -------------------------
 def _tick_price(symbol: str, side: Side) -> float:
-    tick = mt5.symbol_info_tick(symbol)
+    tick = mt5io.symbol_info_tick(symbol)
     if tick is None:
         raise HTTPException(400, f"No tick for {symbol}")
     return float(tick.ask if side == "buy" else tick.bid)
@@ -493,17 +1092,65 @@ def _result_to_dict(res) -> Dict[str, Any]:
     return d
 
 
-def order_send_with_fallback(req: MarketOrderReq) -> Dict[str, Any]:
+# Per-symbol memo of symbols already made visible and of the filling mode the broker accepted.
+_selected_symbols: set[str] = set()
+_filling_by_symbol: Dict[str, int] = {}
+
+# symbol_info().filling_mode is a bitmask of these flags
+_SYMBOL_FILLING_FOK = getattr(mt5, "SYMBOL_FILLING_FOK", 1)
+_SYMBOL_FILLING_IOC = getattr(mt5, "SYMBOL_FILLING_IOC", 2)
+
+
+def _forget_selected(worker: int) -> None:
+    """A respawned gateway worker is a fresh terminal session: select its symbols again."""
+    stale = {s for s in list(_selected_symbols) if mt5_gateway.shard(s) == worker}
+    _selected_symbols.difference_update(stale)
+    if stale:
+        logger.info(f"gateway worker {worker} respawned; re-selecting {len(stale)} symbols on next use")
+
+
+if mt5_gateway is not None:
+    mt5_gateway.on_respawn = _forget_selected
+
+
+def _ensure_selected(symbol: str) -> bool:
+    """``symbol_select`` once per symbol (per terminal session); later calls are answered from the memo."""
+    if symbol in _selected_symbols:
+        return True
+    if not mt5io.symbol_select(symbol, True):
+        return False
+    _selected_symbols.add(symbol)
+    return True
+
+
+def _filling_candidates(symbol: str) -> List[int]:
+    """Filling modes to try, best guess first: learned mode, then what symbol_info allows."""
+    candidates: List[int] = []
+    learned = _filling_by_symbol.get(symbol)
+    if learned is not None:
+        candidates.append(learned)
+    info = mt5io.symbol_info(symbol) if learned is None else None
+    flags = _safe_int(getattr(info, "filling_mode", 0)) if info is not None else 0
+    if flags & _SYMBOL_FILLING_FOK:
+        candidates.append(mt5.ORDER_FILLING_FOK)
+    if flags & _SYMBOL_FILLING_IOC:
+        candidates.append(mt5.ORDER_FILLING_IOC)
+    # Common broker requirement order:
+    candidates += [mt5.ORDER_FILLING_FOK, mt5.ORDER_FILLING_IOC, mt5.ORDER_FILLING_RETURN]
+    return list(dict.fromkeys(candidates))
+
+
+def order_send_with_fallback(req: MarketOrderReq, price: Optional[float] = None) -> Dict[str, Any]:
     """Try sending order with requested filling, else try sensible fallbacks."""
-    price = _tick_price(req.symbol, req.side)
+    if price is None:
+        price = _tick_price(req.symbol, req.side)
 
     # If caller specified a filling, try only that
     candidates: List[int]
     if req.filling is not None:
         candidates = [int(req.filling)]
     else:
-        # Common broker requirement order:
-        candidates = [mt5.ORDER_FILLING_FOK, mt5.ORDER_FILLING_IOC, mt5.ORDER_FILLING_RETURN]
+        candidates = _filling_candidates(req.symbol)
 
     last_result = None
     for fill in candidates:
@@ -519,18 +1166,23 @@ def order_send_with_fallback(req: MarketOrderReq) -> Dict[str, Any]:
             magic=req.magic,
             filling=fill,
         )
-        result = mt5.order_send(request)
+        result = mt5io.order_send(request)
         last_result = _result_to_dict(result)
+        ORDER_RETCODES.inc(retcode=last_result["retcode"])
         # 10030 -> unsupported filling mode, try next
         if last_result["retcode"] != 10030:
+            if req.filling is None:
+                _filling_by_symbol[req.symbol] = fill
             break
+        if _filling_by_symbol.get(req.symbol) == fill:
+            _filling_by_symbol.pop(req.symbol, None)
 
     return last_result
 
 
 @app.post("/orders/market")
 def place_market(req: MarketOrderReq):
-    if not mt5.symbol_select(req.symbol, True):
+    if not _ensure_selected(req.symbol):
         raise HTTPException(400, f"Cannot select symbol {req.symbol}")
 
     # Ensure side is lower-case 'buy' | 'sell'
@@ -539,144 +1191,735 @@ def place_market(req: MarketOrderReq):
         raise HTTPException(422, "side must be 'buy' or 'sell'")
 
     res = order_send_with_fallback(req)
+    account_snapshot.poke()  # reflect the fill without waiting a full cadence
     if res["retcode"] != mt5.TRADE_RETCODE_DONE:
         # Return 400 with broker message for the UI to show
         raise HTTPException(400, detail={"message": f"MT5 error {res['retcode']}: {res['comment']}", "result": res})
     return {"ok": True, "result": res}
 
 
+@app.post("/orders/batch")
+def place_market_batch(req: MarketOrderBatchReq):
+    """
+    Submit many market orders in one call, in request order.
+
+    Each symbol is selected and quoted once per batch; results are reported
+    per order (``ok`` plus the MT5 result or an error message) instead of
+    failing the whole batch.
+    """
+    prices: Dict[Tuple[str, str], float] = {}
+    results: List[Dict[str, Any]] = []
+    for i, order in enumerate(req.orders):
+        try:
+            if not _ensure_selected(order.symbol):
+                raise HTTPException(400, f"Cannot select symbol {order.symbol}")
+            key = (order.symbol, order.side)
+            if key not in prices:
+                prices[key] = _tick_price(order.symbol, order.side)
+            res = order_send_with_fallback(order, price=prices[key])
+        except HTTPException as e:
+            results.append({"index": i, "ok": False, "error": e.detail})
+            continue
+        results.append({"index": i, "ok": res["retcode"] == mt5.TRADE_RETCODE_DONE, "result": res})
+    account_snapshot.poke()
+    return {"ok": all(r["ok"] for r in results), "results": results}
+
+
+# -------------------------
+# Tick recorder (optional; enabled by TICK_RECORDER_DIR)
+# -------------------------
+TICK_DIR = os.environ.get("TICK_RECORDER_DIR")
+tick_recorder: Optional[TickRecorder] = TickRecorder(Path(TICK_DIR)) if TICK_DIR else None
+# Appends (memmap writes, segment rollover) run on one writer thread, off the event loop;
+# it is FIFO, so every symbol's ticks are still appended in poll order.
+tick_writer: Optional[ThreadPoolExecutor] = (
+    ThreadPoolExecutor(max_workers=1, thread_name_prefix="tick-recorder") if tick_recorder else None
+)
+tick_reader: Optional[TickReader] = TickReader(Path(TICK_DIR)) if TICK_DIR else None
+
+
+def _record_ticks(symbol: str, ticks) -> None:
+    try:
+        tick_recorder.append(symbol, ticks)
+    except Exception:
+        pass  # recording is best-effort; never break the stream
+
+
+def _to_msc(v: int) -> int:
+    """Accept epoch seconds or milliseconds."""
+    return v * 1000 if v < 100_000_000_000 else v
+
+
+@app.get("/ticks/{symbol}")
+def ticks(
+    symbol: str,
+    from_: int = Query(..., alias="from"),
+    to: Optional[int] = None,
+    format: str = Query("binary"),
+):
+    """
+    Recorded ticks in ``[from, to]`` (epoch seconds or ms).
+
+    ``format=binary`` streams packed ``TICK_DTYPE`` records straight from the
+    memory-mapped segments; ``format=columns`` returns parallel JSON arrays.
+    """
+    if tick_reader is None:
+        raise HTTPException(503, "tick recorder disabled (set TICK_RECORDER_DIR)")
+    lo = _to_msc(from_)
+    hi = _to_msc(to) if to is not None else int(time.time() * 1000)
+    parts = tick_reader.read(symbol, lo, hi)
+    if format == "columns":
+        views = list(parts)
+        arr = np.concatenate(views) if views else np.empty(0, dtype=TICK_DTYPE)
+        return {"symbol": symbol, "columns": {n: arr[n].tolist() for n in TICK_DTYPE.names}}
+    if format != "binary":
+        raise HTTPException(422, "format must be 'binary' or 'columns'")
+
+    def chunks(step: int = 65536):
+        for part in parts:
+            for i in range(0, len(part), step):
+                yield part[i:i + step].tobytes()
+
+    return StreamingResponse(chunks(), media_type=TICK_MEDIA_TYPE, headers={"X-Symbol": symbol})
+
+
 # -------------------------
 # WebSocket streaming
 # -------------------------
-class Hub:
-    def __init__(self):
-        self.clients: set[WebSocket] = set()
+def _price_from_tick(t, fallback: float) -> float:
+    """Prefer the trade ``last`` price; else mid of bid/ask."""
+    try:
+        last = float(_rate_field(t, "last"))
+        if last > 0:
+            return last
+    except Exception:
+        pass
+    bid = float(_rate_field(t, "bid") or 0.0)
+    ask = float(_rate_field(t, "ask") or 0.0)
+    if bid > 0 and ask > 0:
+        return (bid + ask) / 2.0
+    return ask or bid or fallback
+
+
+class StreamClient:
+    """
+    One WebSocket subscriber with a bounded, conflating outbound queue.
+
+    Producers call ``offer()``, which never blocks: a message whose key is
+    already pending replaces the superseded one, and when ``maxsize`` distinct
+    keys are pending the oldest one is dropped.  A per-client writer task
+    drains the queue, so a slow socket only delays itself.  With ``batch_ms``
+    the writer waits that long after the first pending message and sends
+    everything pending as one ``{"type": "batch", "updates": [...]}`` frame.
+    """
+
+    def __init__(self, ws: WebSocket, maxsize: int = 256, batch_ms: int = 0):
+        self.ws = ws
+        self.maxsize = maxsize
+        self.batch_ms = batch_ms
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.max_lag_ms = 0.0
+        self._pending: "OrderedDict[Any, Tuple[str, float]]" = OrderedDict()
+        self._seq = 0  # unique keys for messages that must not be conflated
+        self.close_on_error = False  # single-stream sockets are closed when their stream fails
+        self._wakeup = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self._sending = False  # a popped message is being written
+
+    def start(self) -> "StreamClient":
+        self._writer = asyncio.create_task(self._write_loop())
+        return self
+
+    def offer(self, text: str, key: Any = None) -> bool:
+        """Queue ``text``; messages with the same ``key`` conflate (latest wins)."""
+        if self.closed:
+            return False
+        if key is None:
+            self._seq += 1
+            key = ("_", self._seq)
+        if key in self._pending:
+            self.dropped += 1
+            WS_DROPPED.inc()
+            self._pending[key] = (text, self._pending[key][1])  # keep the original enqueue time for lag
+        else:
+            if len(self._pending) >= self.maxsize:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+                WS_DROPPED.inc()
+            self._pending[key] = (text, time.monotonic())
+        self._wakeup.set()
+        return True
+
+    @property
+    def lag_ms(self) -> float:
+        if not self._pending:
+            return 0.0
+        return (time.monotonic() - next(iter(self._pending.values()))[1]) * 1000.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "lag_ms": round(self.lag_ms, 3),
+            "max_lag_ms": round(self.max_lag_ms, 3),
+        }
+
+    def _track_lag(self, queued_at: float):
+        lag = (time.monotonic() - queued_at) * 1000.0
+        if lag > self.max_lag_ms:
+            self.max_lag_ms = lag
+
+    async def _write_loop(self):
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                if self.batch_ms > 0:
+                    await asyncio.sleep(self.batch_ms / 1000.0)
+                    if not self._pending:
+                        continue
+                    items = list(self._pending.values())
+                    self._pending.clear()
+                    self._sending = True
+                    await self.ws.send_text('{"type":"batch","updates":[' + ",".join(t for t, _ in items) + "]}")
+                    self._sending = False
+                    self.sent += len(items)
+                    WS_SENT.inc(len(items))
+                    WS_FRAMES.inc()
+                    self._track_lag(items[0][1])
+                    continue
+                while self._pending:
+                    _, (text, queued_at) = self._pending.popitem(last=False)
+                    self._sending = True
+                    await self.ws.send_text(text)
+                    self._sending = False
+                    self.sent += 1
+                    WS_SENT.inc()
+                    WS_FRAMES.inc()
+                    self._track_lag(queued_at)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            WS_SEND_FAILURES.inc()
+            self.closed = True
+
+    async def close(self, flush_timeout: float = 1.0):
+        """Flush what is pending (bounded by ``flush_timeout``), then stop the writer."""
+        if self._writer is not None and (self._pending or self._sending) and not self.closed:
+            deadline = time.monotonic() + flush_timeout
+            while (self._pending or self._sending) and not self.closed and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+        self.closed = True
+        if self._writer is not None:
+            self._writer.cancel()
+
+
+class CandleTopic:
+    """One (symbol, timeframe) stream: its subscribers and the bar it aggregates."""
+
+    def __init__(self, symbol: str, timeframe: str):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.step = TF_SECONDS.get(timeframe, 60)
+        self.clients: set[StreamClient] = set()
+        self.bar: Optional[Dict[str, Any]] = None
+        self.last_sent_close: Optional[float] = None
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.symbol, self.timeframe)
+
+    def message(self) -> str:
+        return json.dumps({
+            "type": "tick",
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "bar": self.bar,
+        })
+
+    def seed(self, rate_row) -> None:
+        seed = _rate_to_dict(rate_row)
+        self.bar = {
+            "time": int(seed["time"]),              # bar open, seconds
+            "open": float(seed["open"]),
+            "high": float(seed["high"]),
+            "low":  float(seed["low"]),
+            "close": float(seed["close"]),
+        }
+        self.last_sent_close = self.bar["close"]
+
+    def on_tick(self, sec: int, px: float) -> bool:
+        """Fold one tick into the bar; True when the close changed."""
+        bar = self.bar
+        bar_start = (sec // self.step) * self.step
+
+        # roll to a new bar if needed
+        if bar_start > bar["time"]:
+            prev_close = bar["close"]
+            bar = self.bar = {
+                "time": bar_start,
+                "open": prev_close,
+                "high": prev_close,
+                "low":  prev_close,
+                "close": prev_close,
+            }
+
+        # update OHLC on EVERY tick
+        if px > bar["high"]:
+            bar["high"] = px
+        if px < bar["low"]:
+            bar["low"] = px
+        bar["close"] = px
+
+        # emit every change (or remove this check to emit every tick unconditionally)
+        if bar["close"] != self.last_sent_close:
+            self.last_sent_close = bar["close"]
+            return True
+        return False
 
-    async def connect(self, ws: WebSocket):
-        await ws.accept()
-        self.clients.add(ws)
 
-    def disconnect(self, ws: WebSocket):
+class SymbolFeed:
+    """Tick ingestion for one symbol: the tick cursor plus one ``CandleTopic`` per timeframe."""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.topics: Dict[str, CandleTopic] = {}
+        self.task: Optional[asyncio.Task] = None
+
+
+class Hub:
+    """
+    Fan-out of MT5 ticks to WebSocket subscribers.
+
+    One background poller per symbol owns the tick cursor and feeds the bar
+    aggregators of every subscribed timeframe, so MT5 is polled once per
+    symbol regardless of how many clients and timeframes watch it.  The
+    poller is started by the symbol's first subscriber and cancelled when the
+    last one leaves.  Delivery goes through each client's ``StreamClient``
+    queue, so the poller never waits on a socket.
+    """
+
+    def __init__(self):
+        self.topics: Dict[Tuple[str, str], CandleTopic] = {}
+        self.feeds: Dict[str, SymbolFeed] = {}
+
+    def subscribe(self, client: StreamClient, symbol: str, timeframe: str, throttle_ms: int = 20) -> CandleTopic:
+        key = (symbol, timeframe.upper())
+        topic = self.topics.get(key)
+        if topic is None:
+            topic = self.topics[key] = CandleTopic(symbol, key[1])
+            feed = self.feeds.get(symbol)
+            if feed is None:
+                feed = self.feeds[symbol] = SymbolFeed(symbol)
+            feed.topics[key[1]] = topic
+        feed = self.feeds[symbol]
+        if feed.task is None or feed.task.done():
+            # the first subscriber's throttle drives the shared poll cadence
+            # (a poller that ended anyway is restarted by the next subscriber)
+            feed.task = asyncio.create_task(self._poll(feed, throttle_ms))
+        topic.clients.add(client)
+        if topic.bar is not None:
+            # late joiners get the forming bar right away instead of waiting for the next tick
+            client.offer(topic.message(), topic.key)
+        return topic
+
+    def disconnect(self, client: StreamClient, symbol: str, timeframe: str):
+        key = (symbol, timeframe.upper())
+        topic = self.topics.get(key)
+        if topic is None:
+            return
+        topic.clients.discard(client)
+        if not topic.clients:
+            self._drop_topic(topic)
+
+    def _drop_topic(self, topic: CandleTopic):
+        self.topics.pop(topic.key, None)
+        feed = self.feeds.get(topic.symbol)
+        if feed is None:
+            return
+        feed.topics.pop(topic.timeframe, None)
+        if not feed.topics:
+            self.feeds.pop(topic.symbol, None)
+            # the poller itself may be dropping its last topic (_close_all, send_all);
+            # it must not cancel itself mid-await -- `while feed.topics` ends it instead
+            if feed.task is not None and feed.task is not asyncio.current_task():
+                feed.task.cancel()
+
+    def send_all(self, topic: CandleTopic, text: str):
+        dead = [c for c in topic.clients if not c.offer(text, topic.key)]
+        for c in dead:
+            self.disconnect(c, topic.symbol, topic.timeframe)
+
+    def clients(self) -> List[StreamClient]:
+        seen: Dict[int, StreamClient] = {}
+        for topic in self.topics.values():
+            for c in topic.clients:
+                seen[id(c)] = c
+        return list(seen.values())
+
+    async def _close_all(self, topic: CandleTopic, message: str):
+        """Fail one stream: notify its subscribers and close single-stream sockets."""
+        text = json.dumps({"type": "error", "symbol": topic.symbol, "timeframe": topic.timeframe, "message": message})
+        # unregister first, so the handlers of the sockets closed below find nothing to disconnect
+        self._drop_topic(topic)
+        clients = list(topic.clients)
+        for c in clients:
+            c.offer(text)
+        await asyncio.gather(*(self._close_client(c) for c in clients if c.close_on_error))
+
+    @staticmethod
+    async def _close_client(client: StreamClient):
+        await client.close()
         try:
-            self.clients.discard(ws)
+            await client.ws.close()
         except Exception:
             pass
 
-    async def send_all(self, text: str):
-        dead = []
-        for ws in list(self.clients):
+    async def _seed(self, feed: SymbolFeed):
+        for topic in list(feed.topics.values()):
+            if topic.bar is not None:
+                continue
+            tf = TF_MAP.get(topic.timeframe, mt5.TIMEFRAME_M1)
+            rates = await mt5io.aio.copy_rates_from_pos(feed.symbol, tf, 0, 1)
+            if rates is None or len(rates) == 0:
+                await self._close_all(topic, "No rates")
+                continue
+            topic.seed(rates[0])
+            self.send_all(topic, topic.message())
+
+    async def _poll(self, feed: SymbolFeed, throttle_ms: int):
+        symbol = feed.symbol
+
+        # ---- Millisecond cursor (DON'T use seconds) ----
+        # start slightly in the past so we don't miss first ticks
+        last_msc = int(time.time() * 1000) - 1500
+
+        errors = 0
+        while feed.topics:
+            # a failing MT5 call (e.g. a lost gateway worker) must not end the shared poller:
+            # log it, back off and keep going, so subscribers resume once MT5 answers again
             try:
-                await ws.send_text(text)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.disconnect(ws)
+                # Seed bars of newly subscribed timeframes from MT5
+                await self._seed(feed)
+
+                # Build datetime from milliseconds; subtract 1 ms to include boundary tick
+                start_dt = datetime.fromtimestamp(max(last_msc - 1, 0) / 1000.0, tz=timezone.utc)
+                ticks = await mt5io.aio.copy_ticks_from(symbol, start_dt, 4096, mt5.COPY_TICKS_ALL)
+                TICKS_PER_POLL.observe(0 if ticks is None else len(ticks), symbol=symbol)
+                if tick_writer is not None and ticks is not None and len(ticks) > 0:
+                    tick_writer.submit(_record_ticks, symbol, ticks)
+
+                if ticks is not None and len(ticks) > 0:
+                    topics = [t for t in feed.topics.values() if t.bar is not None]
+                    changed: Dict[Tuple[str, str], CandleTopic] = {}
+                    for t in ticks:
+                        # read both second and millisecond fields safely
+                        sec = int(_rate_field(t, "time"))
+                        msc = int(_rate_field(t, "time_msc"))  # ms since epoch
+                        if msc <= last_msc or not topics:
+                            continue
+                        last_msc = msc
+
+                        px = _price_from_tick(t, topics[0].bar["close"])
+                        for topic in topics:
+                            if topic.on_tick(sec, px):
+                                changed[topic.key] = topic
+
+                    # client queues conflate per stream anyway, so send each changed bar once per poll
+                    for topic in changed.values():
+                        self.send_all(topic, topic.message())
+                errors = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                errors += 1
+                STREAM_POLL_ERRORS.inc(symbol=symbol)
+                logger.warning(f"stream poller {symbol}: {type(e).__name__}: {e} (failure {errors})")
+                await asyncio.sleep(min(0.25 * 2 ** min(errors, 6), 10.0))
+                continue
+
+            await asyncio.sleep(throttle_ms / 1000.0)
 
 
 hub = Hub()
+REGISTRY.gauge(
+    "ws_subscribers", "Subscribers per candle stream",
+    lambda: {(t.symbol, t.timeframe): len(t.clients) for t in list(hub.topics.values())},
+    ("symbol", "timeframe"),
+)
+REGISTRY.gauge("ws_clients", "Connected candle-stream clients", lambda: len(hub.clients()))
 
 
 @app.websocket("/stream/candles")
 async def stream_candles(ws: WebSocket, symbol: str, timeframe: str = "M1", throttle_ms: int = 20):
     await ws.accept()
 
-    TF_SECONDS = {
-        "M1": 60, "M5": 300, "M15": 900, "M30": 1800,
-        "H1": 3600, "H4": 14400, "D1": 86400, "W1": 604800, "MN1": 2592000,
-    }
-    step = TF_SECONDS.get(timeframe.upper(), 60)
-    tf = TF_MAP.get(timeframe.upper(), mt5.TIMEFRAME_M1)
-
-    if not mt5.symbol_select(symbol, True):
+    if not await mt5io.aio.symbol_select(symbol, True):
         await ws.send_text(json.dumps({"type": "error", "message": f"Cannot select {symbol}"}))
         return
 
-    # Seed current bar from MT5
-    rates = mt5.copy_rates_from_pos(symbol, tf, 0, 1)
-    if not rates or len(rates) == 0:
-        await ws.send_text(json.dumps({"type": "error", "message": "No rates"}))
-        return
+    client = StreamClient(ws).start()
+    client.close_on_error = True
+    hub.subscribe(client, symbol, timeframe, throttle_ms)
+    try:
+        # The shared poller does the sending; we only wait for the client to leave.
+        while True:
+            await ws.receive_text()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        hub.disconnect(client, symbol, timeframe)
+        await client.close(flush_timeout=0)
+        try:
+            await ws.close()
+        except Exception:
+            pass
 
-    seed = _rate_to_dict(rates[0])
-    cur_bar = {
-        "time": int(seed["time"]),              # bar open, seconds
-        "open": float(seed["open"]),
-        "high": float(seed["high"]),
-        "low":  float(seed["low"]),
-        "close": float(seed["close"]),
-    }
-    last_sent_close = cur_bar["close"]
 
-    # ---- Millisecond cursor (DON'T use seconds) ----
-    # start slightly in the past so we don't miss first ticks
-    last_msc = int(time.time() * 1000) - 1500
+@app.websocket("/stream")
+async def stream_multiplex(ws: WebSocket, throttle_ms: int = 20, batch_ms: int = 0):
+    """
+    Many (symbol, timeframe) streams over one socket.
+
+    The client sends JSON control messages::
 
-    def price_from_tick(t):
-        # prefer trade last; else mid of bid/ask
+        {"action": "subscribe",   "streams": [{"symbol": "EURUSD", "timeframe": "M1"}, ...]}
+        {"action": "unsubscribe", "streams": [{"symbol": "EURUSD", "timeframe": "M1"}]}
+        {"action": "ping"}
+
+    and receives the same ``tick`` messages as ``/stream/candles`` (batched into
+    ``batch`` frames when ``batch_ms > 0``) plus a ``subscribed`` ack listing
+    the active streams after every change.
+    """
+    await ws.accept()
+    client = StreamClient(ws, maxsize=1024, batch_ms=max(0, batch_ms)).start()
+    subs: set[Tuple[str, str]] = set()
+    try:
+        while True:
+            raw = await ws.receive_text()
+            try:
+                req = json.loads(raw)
+                action = str(req.get("action", "")).lower()
+                streams = req.get("streams")
+                if streams is None and req.get("symbol"):
+                    streams = [{"symbol": req["symbol"], "timeframe": req.get("timeframe", "M1")}]
+            except Exception:
+                client.offer(json.dumps({"type": "error", "message": "invalid control message"}))
+                continue
+
+            if action == "ping":
+                client.offer(json.dumps({"type": "pong"}))
+                continue
+            if action not in ("subscribe", "unsubscribe"):
+                client.offer(json.dumps({"type": "error", "message": f"unknown action {action!r}"}))
+                continue
+            if streams is not None and not isinstance(streams, list):
+                client.offer(json.dumps({"type": "error", "message": "streams must be a list"}))
+                continue
+
+            for st in streams or []:
+                if not isinstance(st, dict):
+                    client.offer(json.dumps({"type": "error", "message": f"invalid stream entry {st!r}"}))
+                    continue
+                symbol = str(st.get("symbol", ""))
+                timeframe = str(st.get("timeframe", "M1")).upper()
+                key = (symbol, timeframe)
+                if action == "unsubscribe":
+                    if key in subs:
+                        subs.discard(key)
+                        hub.disconnect(client, symbol, timeframe)
+                    continue
+                if key in subs:
+                    continue
+                if timeframe not in TF_MAP:
+                    client.offer(json.dumps({"type": "error", "symbol": symbol, "message": f"Unsupported timeframe {timeframe}"}))
+                    continue
+                if not await mt5io.aio.symbol_select(symbol, True):
+                    client.offer(json.dumps({"type": "error", "symbol": symbol, "message": f"Cannot select {symbol}"}))
+                    continue
+                subs.add(key)
+                hub.subscribe(client, symbol, timeframe, throttle_ms)
+
+            client.offer(json.dumps({
+                "type": "subscribed",
+                "streams": [{"symbol": s, "timeframe": tf} for s, tf in sorted(subs)],
+            }))
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        for symbol, timeframe in subs:
+            hub.disconnect(client, symbol, timeframe)
+        await client.close(flush_timeout=0)
         try:
-            last = float(getattr(t, "last", 0.0))
-            if last > 0:
-                return last
+            await ws.close()
         except Exception:
             pass
-        bid = float(getattr(t, "bid", 0.0) or 0.0)
-        ask = float(getattr(t, "ask", 0.0) or 0.0)
-        if bid > 0 and ask > 0:
-            return (bid + ask) / 2.0
-        return ask or bid or cur_bar["close"]
 
-    try:
+
+@app.get("/stream/stats")
+def stream_stats():
+    """Per-topic subscriber counts and per-client queue lag / drop counters."""
+    return {
+        "topics": [
+            {"symbol": t.symbol, "timeframe": t.timeframe, "subscribers": len(t.clients)}
+            for t in hub.topics.values()
+        ],
+        "clients": [c.stats() for c in hub.clients()],
+    }
+
+
+# -------------------------
+# Account / positions / orders snapshots
+# -------------------------
+def _diff_by_ticket(old: Dict[int, Dict[str, Any]], new: Dict[int, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    added = [v for k, v in new.items() if k not in old]
+    removed = [k for k in old if k not in new]
+    changed: Dict[str, Dict[str, Any]] = {}
+    for k, v in new.items():
+        prev = old.get(k)
+        if prev is not None and prev != v:
+            changed[str(k)] = {f: x for f, x in v.items() if prev.get(f) != x}
+    if not (added or removed or changed):
+        return None
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+class AccountSnapshot:
+    """
+    Last known account, positions and orders, polled from MT5 at a fixed cadence.
+
+    REST endpoints serve from the snapshot while it is fresh and
+    ``/stream/account`` subscribers receive one full ``snapshot`` followed by
+    ``diff`` messages (added/removed tickets and changed fields only).  Every
+    message carries ``seq``; a client that was dropped from behind gets a new
+    full snapshot.
+    """
+
+    def __init__(self, interval_ms: int):
+        self.interval = interval_ms / 1000.0
+        self.account: Optional[Dict[str, Any]] = None
+        self.positions: Dict[int, Dict[str, Any]] = {}
+        self.orders: Dict[int, Dict[str, Any]] = {}
+        self.seq = 0
+        self.updated_at = 0.0
+        self.clients: Dict[StreamClient, int] = {}  # client -> drop count already resynced
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() - self.updated_at < max(5 * self.interval, 2.0)
+
+    def snapshot_message(self) -> str:
+        return json.dumps({
+            "type": "snapshot",
+            "seq": self.seq,
+            "account": self.account,
+            "positions": list(self.positions.values()),
+            "orders": list(self.orders.values()),
+        })
+
+    def apply(self, ai, pos, ords) -> Optional[Dict[str, Any]]:
+        """Fold one MT5 read into the snapshot and return the diff (None if unchanged)."""
+        diff: Dict[str, Any] = {}
+        if ai is not None:
+            acc = _account_to_dict(ai)
+            if self.account is None:
+                diff["account"] = acc
+            else:
+                changed = {k: v for k, v in acc.items() if self.account.get(k) != v}
+                if changed:
+                    diff["account"] = changed
+            self.account = acc
+        # None means the read failed; keep the previous state rather than report everything removed
+        if pos is not None:
+            new_pos = {d["ticket"]: d for d in map(_position_to_dict, pos)}
+            d = _diff_by_ticket(self.positions, new_pos)
+            if d:
+                diff["positions"] = d
+            self.positions = new_pos
+        if ords is not None:
+            new_ords = {d["ticket"]: d for d in map(_order_to_dict, ords)}
+            d = _diff_by_ticket(self.orders, new_ords)
+            if d:
+                diff["orders"] = d
+            self.orders = new_ords
+        self.updated_at = time.monotonic()
+        if not diff:
+            return None
+        self.seq += 1
+        return {"type": "diff", "seq": self.seq, **diff}
+
+    def subscribe(self, client: StreamClient):
+        self.clients[client] = client.dropped
+        client.offer(self.snapshot_message())
+
+    def unsubscribe(self, client: StreamClient):
+        self.clients.pop(client, None)
+
+    def poke(self):
+        """Request an immediate refresh (thread-safe)."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _broadcast(self, diff: Dict[str, Any]):
+        text = json.dumps(diff)
+        for client, seen_drops in list(self.clients.items()):
+            if client.dropped != seen_drops:
+                # the client lost messages; replace its backlog with a full snapshot
+                self.clients[client] = client.dropped
+                ok = client.offer(self.snapshot_message())
+            else:
+                ok = client.offer(text)
+            if not ok:
+                self.unsubscribe(client)
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
         while True:
-            # Build datetime from milliseconds; subtract 1 ms to include boundary tick
-            start_dt = datetime.fromtimestamp(max(last_msc - 1, 0) / 1000.0, tz=timezone.utc)
-            ticks = mt5.copy_ticks_from(symbol, start_dt, 4096, mt5.COPY_TICKS_ALL)
-
-            if ticks is not None and len(ticks) > 0:
-                for t in ticks:
-                    # read both second and millisecond fields safely
-                    sec = int(_rate_field(t, "time"))
-                    msc = int(_rate_field(t, "time_msc"))  # ms since epoch
-                    if msc <= last_msc:
-                        continue
-                    last_msc = msc
-
-                    px = price_from_tick(t)
-                    bar_start = (sec // step) * step
-
-                    # roll to a new bar if needed
-                    if bar_start > cur_bar["time"]:
-                        prev_close = cur_bar["close"]
-                        cur_bar = {
-                            "time": bar_start,
-                            "open": prev_close,
-                            "high": prev_close,
-                            "low":  prev_close,
-                            "close": prev_close,
-                        }
-
-                    # update OHLC on EVERY tick
-                    if px > cur_bar["high"]:
-                        cur_bar["high"] = px
-                    if px < cur_bar["low"]:
-                        cur_bar["low"] = px
-                    cur_bar["close"] = px
-
-                    # emit every change (or remove this check to emit every tick unconditionally)
-                    if cur_bar["close"] != last_sent_close:
-                        last_sent_close = cur_bar["close"]
-                        await ws.send_text(json.dumps({
-                            "type": "tick",
-                            "symbol": symbol,
-                            "timeframe": timeframe,
-                            "bar": cur_bar
-                        }))
+            try:
+                ai, pos, ords = await asyncio.gather(
+                    mt5io.aio.account_info(), mt5io.aio.positions_get(), mt5io.aio.orders_get(),
+                )
+                diff = self.apply(ai, pos, ords)
+                if diff:
+                    self._broadcast(diff)
+            except Exception:
+                pass
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
 
-            await asyncio.sleep(throttle_ms / 1000.0)
 
-    except WebSocketDisconnect:
+account_snapshot = AccountSnapshot(int(os.environ.get("ACCOUNT_SNAPSHOT_MS", "500")))
+
+
+@app.on_event("startup")
+async def _start_account_snapshot():
+    asyncio.create_task(account_snapshot.run())
+
+
+@app.websocket("/stream/account")
+async def stream_account(ws: WebSocket):
+    """Push account/positions/orders: one ``snapshot`` then ``diff`` messages."""
+    await ws.accept()
+    client = StreamClient(ws).start()
+    account_snapshot.subscribe(client)
+    try:
+        while True:
+            await ws.receive_text()
+    except (WebSocketDisconnect, RuntimeError):
         pass
     finally:
+        account_snapshot.unsubscribe(client)
+        await client.close(flush_timeout=0)
         try:
             await ws.close()
         except Exception:
-            pass
\ No newline at end of file
+            pass
@@ -0,0 +1,25 @@
+"""Run the server against the fake MT5 backend (fake_mt5.py)."""
+
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("MT5_BACKEND", "fake")
+os.environ.setdefault("INDICATOR_JOBS", "0")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def server():
+    import server
+    return server
+
+
+@pytest.fixture(scope="session")
+def client(server):
+    # one app lifetime per run: shutdown stops the MT5 executor for good
+    with TestClient(server.app) as c:
+        yield c
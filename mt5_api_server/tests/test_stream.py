@@ -0,0 +1,32 @@
+import json
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+
+def test_candles_no_rates_closes_socket(server, client, monkeypatch):
+    monkeypatch.setattr(server.mt5, "copy_rates_from_pos", lambda *a, **k: None)
+    with client.websocket_connect("/stream/candles?symbol=EURUSD&timeframe=M1") as ws:
+        msg = json.loads(ws.receive_text())
+        assert msg["type"] == "error" and msg["message"] == "No rates"
+        with pytest.raises(WebSocketDisconnect):
+            ws.receive_text()
+    assert ("EURUSD", "M1") not in server.hub.topics
+    assert "EURUSD" not in server.hub.feeds
+
+
+def test_multiplex_rejects_malformed_streams(client):
+    with client.websocket_connect("/stream") as ws:
+        ws.send_text(json.dumps({"action": "subscribe", "streams": ["EURUSD"]}))
+        assert json.loads(ws.receive_text())["type"] == "error"
+        assert json.loads(ws.receive_text()) == {"type": "subscribed", "streams": []}
+
+        ws.send_text(json.dumps({"action": "subscribe", "streams": "EURUSD"}))
+        assert json.loads(ws.receive_text())["type"] == "error"
+
+        # the connection is still usable
+        ws.send_text(json.dumps({"action": "subscribe", "streams": [{"symbol": "EURUSD", "timeframe": "M1"}]}))
+        msg = json.loads(ws.receive_text())
+        while msg["type"] != "subscribed":
+            msg = json.loads(ws.receive_text())
+        assert msg["streams"] == [{"symbol": "EURUSD", "timeframe": "M1"}]
@@ -0,0 +1,233 @@
+"""Fixed-capacity bar buffers backed by preallocated NumPy arrays.
+
+Both the API server (candle cache) and the trading engine keep a rolling
+window of OHLC bars per (symbol, timeframe).  ``BarRing`` stores those bars
+in a NumPy structured array with a fixed retention window:
+
+* appends are amortised O(1) -- the backing array holds twice the capacity
+  and the live window is slid back to the front only when the tail runs out,
+* the forming (last) bar can be updated in place,
+* ``view(n)`` always returns a contiguous, zero-copy slice of the newest
+  ``n`` bars in ascending time order.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class BarRing:
+    """Rolling window of at most ``capacity`` rows of a structured dtype."""
+
+    def __init__(self, capacity: int, dtype: np.dtype, *, time_field: str = "time"):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self.dtype = np.dtype(dtype)
+        self.time_field = time_field
+        self._buf = np.zeros(2 * self.capacity, dtype=self.dtype)
+        self._lo = 0
+        self._hi = 0
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._buf.nbytes)
+
+    @property
+    def last_time(self) -> Optional[int]:
+        if self._hi == self._lo:
+            return None
+        return int(self._buf[self.time_field][self._hi - 1])
+
+    # ------------------------------------------------------------------
+    def view(self, n: Optional[int] = None) -> np.ndarray:
+        """Return the newest ``n`` rows (all rows when ``n`` is None) without copying."""
+
+        lo = self._lo if n is None else max(self._hi - int(n), self._lo)
+        return self._buf[lo:self._hi]
+
+    # ------------------------------------------------------------------
+    def clear(self) -> None:
+        self._lo = self._hi = 0
+
+    # ------------------------------------------------------------------
+    def _make_room(self, extra: int) -> None:
+        if self._hi + extra <= len(self._buf):
+            return
+        keep = max(self.capacity - extra, 0)
+        live = self.view(keep)
+        self._buf[:len(live)] = live
+        self._lo, self._hi = 0, len(live)
+
+    # ------------------------------------------------------------------
+    def extend(self, rows: np.ndarray) -> None:
+        """Append rows, dropping the oldest ones beyond ``capacity``."""
+
+        if len(rows) == 0:
+            return
+        if len(rows) > self.capacity:
+            rows = rows[-self.capacity:]
+        n = len(rows)
+        self._make_room(n)
+        for name in self.dtype.names:
+            self._buf[name][self._hi:self._hi + n] = rows[name]
+        self._hi += n
+        if self._hi - self._lo > self.capacity:
+            self._lo = self._hi - self.capacity
+
+    # ------------------------------------------------------------------
+    def append(self, row) -> None:
+        """Append a single row (tuple in dtype field order or structured scalar)."""
+
+        self._make_room(1)
+        self._buf[self._hi] = row
+        self._hi += 1
+        if self._hi - self._lo > self.capacity:
+            self._lo += 1
+
+    # ------------------------------------------------------------------
+    def update_last(self, row) -> None:
+        """Overwrite the newest row in place (e.g. the forming bar)."""
+
+        if self._hi == self._lo:
+            raise IndexError("update_last on empty BarRing")
+        self._buf[self._hi - 1] = row
+
+    # ------------------------------------------------------------------
+    def merge(self, rows: np.ndarray) -> bool:
+        """Merge ascending ``rows`` that may overlap the newest stored bars.
+
+        Rows older than the newest stored bar are ignored, a row with the same
+        time replaces it (the forming bar moved) and newer rows are appended.
+        Returns False when ``rows`` does not reach back to the newest stored
+        bar, i.e. there is a gap and the caller should reload.
+        """
+
+        if len(rows) == 0:
+            return True
+        last = self.last_time
+        if last is None:
+            self.extend(rows)
+            return True
+        times = rows[self.time_field]
+        if int(times[0]) > last:
+            return False
+        i = int(np.searchsorted(times, last, side="left"))
+        if i < len(rows) and int(times[i]) == last:
+            self._buf[self._hi - 1] = rows[i]
+            i += 1
+        self.extend(rows[i:])
+        return True
+
+
+# ----------------------------------------------------------------------
+# Wire format shared by the API server and its Python clients
+# ----------------------------------------------------------------------
+CANDLE_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<i8"),
+])
+CANDLE_MEDIA_TYPE = "application/vnd.mt5.candles"
+
+# Bar length per timeframe name; the one table the server, feeds and tools share.
+TF_SECONDS: Dict[str, int] = {
+    "M1": 60, "M5": 300, "M15": 900, "M30": 1800,
+    "H1": 3600, "H4": 14400, "D1": 86400, "W1": 604800, "MN1": 2592000,
+}
+
+
+def rates_to_candles(rates: np.ndarray) -> np.ndarray:
+    """Convert an MT5 rates array to packed little-endian ``CANDLE_DTYPE`` records.
+
+    Mirrors the per-row conversion of the REST API: ``real_volume`` is used as
+    volume when the field is present, otherwise ``tick_volume``.
+    """
+
+    out = np.empty(len(rates), dtype=CANDLE_DTYPE)
+    for name in ("time", "open", "high", "low", "close"):
+        out[name] = rates[name]
+    names = rates.dtype.names or ()
+    out["volume"] = rates["real_volume"] if "real_volume" in names else rates["tick_volume"]
+    return out
+
+
+# ----------------------------------------------------------------------
+# Engine-side bar store
+# ----------------------------------------------------------------------
+# Strategy-facing column names (the engine's DataFrame schema) -> CANDLE_DTYPE fields
+FRAME_COLUMNS = {"ts": "time", "o": "open", "h": "high", "l": "low", "c": "close", "v": "volume"}
+
+
+class BarStore:
+    """Fixed-retention OHLCV history for one (symbol, timeframe) in the live engine.
+
+    Streamed updates of the forming bar overwrite it in place and a new bar
+    time appends, so memory and per-update cost stay constant however long
+    the engine runs.  ``col("c")`` returns zero-copy column views; ``frame()``
+    materialises the ``ts/o/h/l/c/v`` DataFrame strategies expect, at most
+    once per update and only when someone asks for it.
+    """
+
+    def __init__(self, capacity: int = 2000):
+        self.ring = BarRing(capacity, CANDLE_DTYPE)
+        self.version = 0
+        self._frame = None
+        self._frame_version = -1
+
+    def __len__(self) -> int:
+        return len(self.ring)
+
+    @property
+    def capacity(self) -> int:
+        return self.ring.capacity
+
+    # ------------------------------------------------------------------
+    def load(self, candles: np.ndarray) -> None:
+        """Replace the history with packed ``CANDLE_DTYPE`` records (warmup)."""
+
+        self.ring.clear()
+        self.ring.extend(candles)
+        self.version += 1
+
+    def push(self, ts: int, o: float, h: float, l: float, c: float, v: float) -> bool:
+        """Apply one streamed bar; returns True when it opened a new bar."""
+
+        row = (int(ts), float(o), float(h), float(l), float(c), int(v))
+        last = self.ring.last_time
+        self.version += 1
+        if last is not None and int(ts) == last:
+            self.ring.update_last(row)
+            return False
+        if last is not None and int(ts) < last:
+            return False  # late update for an already closed bar
+        self.ring.append(row)
+        return True
+
+    # ------------------------------------------------------------------
+    def view(self, n: Optional[int] = None) -> np.ndarray:
+        return self.ring.view(n)
+
+    def col(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """Zero-copy view of one column by frame name (``"c"``) or field name (``"close"``)."""
+
+        return self.ring.view(n)[FRAME_COLUMNS.get(name, name)]
+
+    def frame(self):
+        """``ts/o/h/l/c/v`` DataFrame of the retained bars, rebuilt only after an update."""
+
+        if self._frame_version != self.version:
+            bars = self.ring.view()
+            self._frame = pd.DataFrame({k: bars[f] for k, f in FRAME_COLUMNS.items()})
+            self._frame_version = self.version
+        return self._frame
@@ -0,0 +1,151 @@
+"""Change-notification control plane for running engines.
+
+The engine's hot path used to ask ``StrategySelectionStore.is_enabled`` for
+every strategy on every candle, which ``stat()``-ed the selection file each
+time, and strategy parameters could only change with a restart.
+
+``ControlPlane`` watches (``watchdog``) the selection file written by
+``POST /strategy/selection`` and ``config.yaml``, and pushes changes into
+the engine on its event loop:
+
+* selection  -> ``Engine.set_enabled`` (the hot path checks an in-memory set),
+* ``strategies:`` params -> ``Engine.reconfigure`` with freshly built
+  instances for the strategies whose params changed (or that were added /
+  removed).  The engine re-seeds their state from the bars it already holds,
+  so a rebuilt strategy is warm on the next candle.
+
+Files that fail to parse (e.g. caught mid-write) are ignored; the next
+change event retries.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set
+
+import yaml
+from loguru import logger
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+# cfg -> {name: strategy}; run_live.build_strategies
+StrategyFactory = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class _Handler(FileSystemEventHandler):
+    def __init__(self, owner: "ControlPlane"):
+        self.owner = owner
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.owner.changed(Path(event.src_path))
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.owner.changed(Path(event.src_path))
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.owner.changed(Path(event.dest_path))
+
+
+class ControlPlane:
+    """Push strategy selection and parameter changes into a running ``Engine``."""
+
+    def __init__(self, selection_path: Path, config_path: Optional[Path] = None,
+                 build_strategies: Optional[StrategyFactory] = None):
+        self.selection_path = Path(selection_path).resolve()
+        self.config_path = Path(config_path).resolve() if config_path else None
+        self.build_strategies = build_strategies
+        self._engine = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._observer: Optional[Observer] = None
+        self._lock = threading.Lock()
+        self._selection: Optional[Set[str]] = None
+        self._params: Optional[Dict[str, Any]] = None
+
+    # ------------------------------------------------------------------
+    def start(self, engine, loop: asyncio.AbstractEventLoop) -> "ControlPlane":
+        self._engine = engine
+        self._loop = loop
+        self._params = self._read_params()
+        self._reload_selection()
+        self._observer = Observer()
+        dirs = {self.selection_path.parent}
+        if self.config_path is not None and self.build_strategies is not None:
+            dirs.add(self.config_path.parent)
+        for d in dirs:
+            d.mkdir(parents=True, exist_ok=True)
+            self._observer.schedule(_Handler(self), str(d), recursive=False)
+        self._observer.start()
+        return self
+
+    def stop(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+
+    # ------------------------------------------------------------------
+    def changed(self, path: Path) -> None:
+        """Watchdog callback (observer thread)."""
+
+        path = path.resolve()
+        if path == self.selection_path:
+            self._reload_selection()
+        elif path == self.config_path and self.build_strategies is not None:
+            self._reload_params()
+
+    def _push(self, fn: Callable, *args) -> None:
+        if self._loop is None or self._loop.is_closed():
+            return
+        # engine state is only touched on its own loop, between candles
+        self._loop.call_soon_threadsafe(fn, *args)
+
+    def _reload_selection(self) -> None:
+        try:
+            data = json.loads(self.selection_path.read_text(encoding="utf-8"))
+            selection = set(str(x) for x in data.get("strategies", []))
+        except FileNotFoundError:
+            selection = set()
+        except (OSError, ValueError, AttributeError):
+            return
+        with self._lock:
+            if selection == self._selection:
+                return
+            self._selection = selection
+        logger.info(f"control: strategy selection -> {sorted(selection) or 'all'}")
+        self._push(self._engine.set_enabled, selection)
+
+    def _read_params(self) -> Optional[Dict[str, Any]]:
+        if self.config_path is None:
+            return None
+        try:
+            cfg = yaml.safe_load(self.config_path.read_text(encoding="utf-8")) or {}
+            return dict(cfg.get("strategies") or {})
+        except (OSError, yaml.YAMLError, AttributeError):
+            return None
+
+    def _reload_params(self) -> None:
+        params = self._read_params()
+        if params is None:
+            return
+        with self._lock:
+            old = self._params or {}
+            if params == old:
+                return
+            self._params = params
+        changed = {name: p for name, p in params.items() if old.get(name) != p}
+        removed = [name for name in old if name not in params]
+        try:
+            built = self.build_strategies({"strategies": changed}) if changed else {}
+        except Exception as e:  # bad params: keep the running instances
+            logger.warning(f"control: cannot rebuild {sorted(changed)}: {e}")
+            with self._lock:
+                self._params = old
+            return
+        logger.info(f"control: rebuilding {sorted(built)}" + (f", removing {removed}" if removed else ""))
+        self._push(self._engine.reconfigure, built, removed)
@@ -1,8 +1,9 @@
 import asyncio, time
-from typing import Dict, Callable, Optional, Tuple
+from typing import Any, Dict, Callable, Iterable, List, Optional, Tuple
 
 from loguru import logger
 
+from .bars import BarStore
 from .broker_paper import PaperBroker
 from .risk import RiskManager
 from .signal_logger import SignalLogger
@@ -21,6 +22,8 @@ class Engine:
         broker=None,
         signal_logger: Optional[SignalLogger] = None,
         selection_store: Optional[StrategySelectionStore] = None,
+        history_bars: int = 2000,
+        control=None,
     ):
         self.feed_live = feed_live
         self.feed_hist = feed_hist
@@ -30,22 +33,84 @@ class Engine:
         self.broker = broker or PaperBroker()
         self.signal_logger = signal_logger
         self.selection_store = selection_store
+        self.history_bars = history_bars
+        self.control = control  # trader.core.control.ControlPlane, started by run()
+        # hot path checks this set; None = every strategy enabled (empty selection)
+        self.enabled: Optional[frozenset] = None
+        if selection_store is not None:
+            self.set_enabled(selection_store.all())
+        self.bars: Dict[Tuple[str, str], BarStore] = {}
+        self.states: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._incremental = self._incremental_names()
+        self.health: Dict[str, Dict[str, float]] = {}  # per symbol: updates, last bar, last receipt
         self._open_trades: Dict[Tuple[str, str], Dict] = {}
 
+    def _incremental_names(self):
+        # strategies with the O(1) update API (trader/strategies/incremental.py)
+        return {name for name, strat in self.strategies.items()
+                if hasattr(strat, "advance") and hasattr(strat, "evaluate")}
+
+    def set_enabled(self, names: Iterable[str]) -> None:
+        self.enabled = frozenset(names) or None
+
+    def reconfigure(self, strategies: Dict[str, Callable], removed: List[str] = ()) -> None:
+        """Swap in rebuilt strategies, warm-started from the bars already held per symbol."""
+
+        for name in removed:
+            self.strategies.pop(name, None)
+            for states in self.states.values():
+                states.pop(name, None)
+        for name, strat in strategies.items():
+            self.strategies[name] = strat
+            for key, states in self.states.items():
+                states[name] = strat.init(self.bars[key].frame().copy())
+        self._incremental = self._incremental_names()
+
+    def resume_open_trades(self, signals: Iterable[Dict[str, Any]]) -> int:
+        """Track still-open logged signals (e.g. after a restart) so their SL/TP resolve them."""
+
+        n = 0
+        for rec in signals:
+            if rec.get("status", "open") != "open":
+                continue
+            self._open_trades[(rec["symbol"], rec["strategy"])] = {
+                "signal_id": rec["id"],
+                "side": Side(rec["side"]),
+                "sl": rec["stop_loss"],
+                "tp": rec["take_profit"],
+            }
+            n += 1
+        return n
+
+    async def run(self, symbols: List[str], timeframe: str):
+        if self.control is not None:
+            self.control.start(self, asyncio.get_running_loop())
+        try:
+            await asyncio.gather(*(self.run_symbol(sym, timeframe) for sym in symbols))
+        finally:
+            if self.control is not None:
+                self.control.stop()
+
     async def run_symbol(self, symbol:str, timeframe:str):
-        # warmup history for each strategy
-        import pandas as pd
-        hist=self.feed_hist.candles(symbol, timeframe, limit=2000)
-        df=pd.DataFrame([{"ts":c.ts,"o":c.o,"h":c.h,"l":c.l,"c":c.c,"v":c.v} for c in hist])
-        states={name: strat.init(df.copy()) for name, strat in self.strategies.items()}
+        # warmup history for each strategy; the store keeps a fixed window from here on
+        store=self.bars[(symbol, timeframe)]=BarStore(self.history_bars)
+        store.load(self.feed_hist.array(symbol, timeframe, limit=self.history_bars))
+        states=self.states[(symbol, timeframe)]={
+            name: strat.init(store.frame().copy()) for name, strat in self.strategies.items()
+        }
 
         async for candle in self.feed_live.stream(symbol, timeframe):
-            df.loc[len(df)]={"ts":candle.ts,"o":candle.o,"h":candle.h,"l":candle.l,"c":candle.c,"v":candle.v}
+            store.push(candle.ts, candle.o, candle.h, candle.l, candle.c, candle.v)
+            h=self.health.setdefault(symbol, {"updates": 0})
+            h["updates"]+=1; h["last_bar"]=candle.ts; h["received_at"]=time.time()
             price=candle.c
             self.broker.on_mark(symbol, price)
+            # incremental strategies see every bar, even while skipped below
+            for name in self._incremental:
+                self.strategies[name].advance(candle, states[name])
 
             for name, strat in self.strategies.items():
-                if self.selection_store and not self.selection_store.is_enabled(name):
+                if self.enabled is not None and name not in self.enabled:
                     continue
 
                 trade_key = (symbol, name)
@@ -67,9 +132,13 @@ class Engine:
                     else:
                         continue
 
-                sig = strat.on_candle(df, states[name])
+                if name in self._incremental:
+                    sig = strat.evaluate(states[name])  # O(1), no DataFrame
+                else:
+                    sig = strat.on_candle(store.frame(), states[name])
                 if sig and sig.side!=Side.FLAT:
-                    sl,tp,pivot = self.risk.stop_target(df, sig.side, price, sig.extras.get("atr"))
+                    # frame is built lazily, at most once per update
+                    sl,tp,pivot = self.risk.stop_target(store.frame(), sig.side, price, sig.extras.get("atr"))
                     qty = self.sizer.qty(self.broker.equity, price, sl)
                     if qty<=0:
                         logger.info(f"{symbol} {name}: qty=0 — skip");
@@ -1,26 +1,168 @@
-import asyncio, json, requests, websockets
-from typing import AsyncIterator, List, Dict
+import asyncio, json, random, time, requests, websockets
+from collections import deque
+from typing import AsyncIterator, Deque, List, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from loguru import logger
+from .bars import CANDLE_DTYPE, TF_SECONDS
 from .types import Candle
 
+try:  # optional faster decoder for the live stream
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
 class HistoryFeed:
-    def __init__(self, base:str): self.base=base.rstrip("/")
+    def __init__(self, base:str):
+        self.base=base.rstrip("/")
+        self.s=requests.Session()  # keep-alive across symbols / backfills
+    def array(self, symbol:str, timeframe:str, limit:int=2000)->np.ndarray:
+        """Fetch bars as packed ``CANDLE_DTYPE`` records (binary /candles format)."""
+        u=f"{self.base}/candles/{symbol}?timeframe={timeframe}&limit={limit}&format=binary"
+        r=self.s.get(u, timeout=20); r.raise_for_status()
+        return np.frombuffer(r.content, dtype=CANDLE_DTYPE)
+    def frame(self, symbol:str, timeframe:str, limit:int=2000)->pd.DataFrame:
+        a=self.array(symbol, timeframe, limit)
+        return pd.DataFrame({"ts":a["time"],"o":a["open"],"h":a["high"],"l":a["low"],"c":a["close"],"v":a["volume"]})
     def candles(self, symbol:str, timeframe:str, limit:int=2000)->List[Candle]:
-        u=f"{self.base}/candles/{symbol}?timeframe={timeframe}&limit={limit}"
-        arr=requests.get(u, timeout=20).json()
-        return [Candle(ts=int(pd['time']/1000) if isinstance(pd['time'],int) else
-                       int(__import__('datetime').datetime.fromisoformat(pd['time'].replace('Z','+00:00')).timestamp()),
-                       o=pd['open'],h=pd['high'],l=pd['low'],c=pd['close'],v=pd.get('tick_volume',0)) for pd in arr]
+        a=self.array(symbol, timeframe, limit)
+        return [Candle(*row) for row in zip(a["time"].tolist(), a["open"].tolist(), a["high"].tolist(),
+                                            a["low"].tolist(), a["close"].tolist(), a["volume"].tolist())]
+
+class _Subscription:
+    """Per-(symbol, timeframe) inbox; updates of the same bar conflate (latest wins)."""
+
+    __slots__ = ("pending", "ready", "last_ts")
+
+    def __init__(self):
+        self.pending: Deque[Candle] = deque()
+        self.ready = asyncio.Event()
+        self.last_ts: Optional[int] = None
+
+    def put(self, candle: Candle) -> None:
+        if self.last_ts is not None and candle.ts < self.last_ts:
+            return  # late update for a bar already superseded
+        if self.pending and self.pending[-1].ts == candle.ts:
+            self.pending[-1] = candle
+        else:
+            self.pending.append(candle)
+        self.last_ts = candle.ts
+        self.ready.set()
+
 
 class LiveFeed:
-    def __init__(self, ws_url:str): self.ws_url=ws_url
+    """One multiplexed ``/stream`` connection shared by every symbol the engine trades.
+
+    ``stream(symbol, timeframe)`` registers a subscription and yields its bars;
+    a single reader task demultiplexes ``tick`` / ``batch`` frames into the
+    per-subscription inboxes.  When the socket drops, the reader reconnects
+    with exponential backoff and re-subscribes; with ``history`` set, the bars
+    that closed during the outage are fetched and replayed first, so the
+    consumers see a gap-free sequence and never notice the reconnect.
+    """
+
+    def __init__(self, ws_url:str, *, history:Optional[HistoryFeed]=None, throttle_ms:int=20, batch_ms:int=0,
+                 min_backoff_s:float=0.5, max_backoff_s:float=30.0):
+        self.ws_url=ws_url.rstrip("/")
+        self.history=history
+        self.throttle_ms=throttle_ms
+        self.batch_ms=batch_ms
+        self.min_backoff_s=min_backoff_s
+        self.max_backoff_s=max_backoff_s
+        self.subs: Dict[Tuple[str, str], _Subscription] = {}
+        self.reconnects=0
+        self._ws=None
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
     async def stream(self, symbol:str, timeframe:str)->AsyncIterator[Candle]:
-        url=f"{self.ws_url}/stream/candles?symbol={symbol}&timeframe={timeframe}"
-        async with websockets.connect(url, ping_interval=20) as ws:
-            # keepalive loop; server sends last-candle on every update
+        key=(symbol, timeframe.upper())
+        sub=self.subs[key]=_Subscription()
+        if self._task is None or self._task.done():
+            self._task=asyncio.create_task(self._run())
+        else:
+            await self._send("subscribe", [key])
+        try:
             while True:
-                msg=await ws.recv()
-                obj=json.loads(msg)
-                cd=obj["candle"]
-                # ISO → epoch
-                ts=int(__import__('datetime').datetime.fromisoformat(cd["time"].replace('Z','+00:00')).timestamp())
-                yield Candle(ts, cd["open"], cd["high"], cd["low"], cd["close"], cd.get("tick_volume",0))
+                await sub.ready.wait()
+                while sub.pending:
+                    yield sub.pending.popleft()
+                sub.ready.clear()
+        finally:
+            self.subs.pop(key, None)
+            await self._send("unsubscribe", [key])
+            if not self.subs and self._task is not None:
+                self._task.cancel()
+
+    async def _send(self, action:str, keys)->None:
+        ws=self._ws
+        if ws is None or not keys:
+            return  # (re)subscribed on connect
+        try:
+            await ws.send(json.dumps({"action": action, "streams": [{"symbol": s, "timeframe": tf} for s, tf in keys]}))
+        except Exception:
+            pass  # the reader notices the dead socket and reconnects
+
+    # ------------------------------------------------------------------
+    async def _run(self)->None:
+        url=f"{self.ws_url}/stream?throttle_ms={self.throttle_ms}&batch_ms={self.batch_ms}"
+        backoff=self.min_backoff_s
+        while self.subs:
+            try:
+                async with websockets.connect(url, ping_interval=20) as ws:
+                    self._ws=ws
+                    await self._send("subscribe", list(self.subs))
+                    if self.reconnects:
+                        await self._backfill()
+                    backoff=self.min_backoff_s
+                    async for raw in ws:
+                        self._dispatch(raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"live feed: {type(e).__name__}: {e}; reconnecting in {backoff:.1f}s")
+            finally:
+                self._ws=None
+            self.reconnects+=1
+            await asyncio.sleep(backoff*(0.5+random.random()))
+            backoff=min(backoff*2, self.max_backoff_s)
+
+    def _dispatch(self, raw)->None:
+        obj=_loads(raw)
+        kind=obj.get("type")
+        if kind=="tick":
+            self._deliver(obj)
+        elif kind=="batch":
+            for u in obj["updates"]:
+                if u.get("type")=="tick":
+                    self._deliver(u)
+        elif kind=="error":
+            logger.warning(f"live feed: {obj.get('symbol') or ''} {obj.get('message')}")
+
+    def _deliver(self, obj)->None:
+        sub=self.subs.get((obj["symbol"], obj["timeframe"]))
+        if sub is None:
+            return
+        b=obj["bar"]
+        # bar time is epoch seconds already
+        sub.put(Candle(b["time"], b["open"], b["high"], b["low"], b["close"], b.get("tick_volume", 0)))
+
+    async def _backfill(self)->None:
+        """Replay bars from the last one seen before the disconnect up to now."""
+
+        if self.history is None:
+            return
+        now=time.time()
+        for (symbol, tf), sub in list(self.subs.items()):
+            if sub.last_ts is None:
+                continue
+            bars=int((now-sub.last_ts)//TF_SECONDS.get(tf, 60))+2
+            try:
+                a=await asyncio.to_thread(self.history.array, symbol, tf, min(bars, 10_000))
+            except Exception as e:
+                logger.warning(f"live feed: backfill {symbol} {tf} failed: {e}")
+                continue
+            for row in zip(a["time"].tolist(), a["open"].tolist(), a["high"].tolist(),
+                           a["low"].tolist(), a["close"].tolist(), a["volume"].tolist()):
+                if row[0]>=sub.last_ts:
+                    sub.put(Candle(*row))
@@ -0,0 +1,115 @@
+"""On-disk warmup history so engine restarts only fetch what is new.
+
+``CachedHistoryFeed`` is a drop-in ``HistoryFeed`` whose ``array()`` keeps
+the newest bars of each (symbol, timeframe) -- as many as the largest
+``limit`` asked for -- as a packed
+``CANDLE_DTYPE`` ``.npy`` file (default ``trader/logs/history``).  On the
+next start the file is memory-mapped and only the tail since the last
+cached bar is requested:
+
+* the newest ``n`` bars are fetched by count (``/candles?limit=n``): two
+  bars first, then -- if they do not reach back to the cached last bar --
+  ``n`` sized from the newest fetched bar's time (broker-server time, so the
+  local clock plays no part) and grown until the fetched bars overlap the
+  cache;
+* fetched bars replace cached bars from the first fetched time on (the
+  cached last bar may have still been forming);
+* a missing, short or unreadable file, or a gap as long as the cached
+  window, falls back to a full fetch of that window, which replaces the file;
+* smaller requests (e.g. ``LiveFeed`` reconnect backfills) are merged into
+  the cache and never shrink it.
+
+Files are written to a temporary name and renamed into place.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+
+from .bars import CANDLE_DTYPE, TF_SECONDS
+from .feed import HistoryFeed
+
+
+class CachedHistoryFeed(HistoryFeed):
+    """``HistoryFeed`` backed by a per-(symbol, timeframe) ``.npy`` cache."""
+
+    def __init__(self, base: str, directory: Path):
+        super().__init__(base)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.fetched_bars = 0
+
+    def path(self, symbol: str, timeframe: str) -> Path:
+        name = re.sub(r"[^\w.-]", "_", symbol)
+        return self.directory / f"{name}_{timeframe.upper()}.npy"
+
+    # ------------------------------------------------------------------
+    def array(self, symbol: str, timeframe: str, limit: int = 2000) -> np.ndarray:
+        path = self.path(symbol, timeframe)
+        cached = self._read(path)
+        have = len(cached)
+        keep = max(have, limit)  # small requests (reconnect backfills) never shrink the cache
+        fresh = self._tail(symbol, timeframe, cached, keep) if have >= limit else None
+        if fresh is None:
+            self.misses += 1
+            merged = self._fetch(symbol, timeframe, keep)
+        else:
+            self.hits += 1
+            # copies, so the memory map is released before the file is replaced
+            merged = np.concatenate([cached[cached["time"] < fresh["time"][0]][-keep:], fresh])[-keep:]
+        del cached
+        if len(merged):
+            self._write(path, merged)
+        if fresh is not None:
+            logger.debug(f"history {symbol} {timeframe}: cache + {len(fresh)} new bars")
+        return merged[-limit:]
+
+    def _fetch(self, symbol: str, timeframe: str, limit: int) -> np.ndarray:
+        a = super().array(symbol, timeframe, limit)
+        self.fetched_bars += len(a)
+        return a
+
+    def _tail(self, symbol: str, timeframe: str, cached: np.ndarray, window: int) -> Optional[np.ndarray]:
+        """Newest bars overlapping the cache, or None when the gap spans ``window`` bars."""
+
+        last = int(cached["time"][-1])
+        step = TF_SECONDS.get(timeframe.upper(), 60)
+        n = 2
+        while n < window:
+            fresh = self._fetch(symbol, timeframe, n)
+            if not len(fresh):
+                return None
+            if int(fresh["time"][0]) <= last:
+                return fresh
+            # size the next fetch from the server's newest bar (x4 covers weekends / gaps)
+            n = max(n * 4, int((int(fresh["time"][-1]) - last) // step) + 2)
+        return None
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _read(path: Path) -> np.ndarray:
+        try:
+            a = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        if a.dtype != CANDLE_DTYPE or a.ndim != 1:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        return a
+
+    @staticmethod
+    def _write(path: Path, bars: np.ndarray) -> None:
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            with tmp.open("wb") as fh:
+                np.save(fh, np.ascontiguousarray(bars, dtype=CANDLE_DTYPE))
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"history cache: cannot write {path.name}: {e}")
@@ -0,0 +1,243 @@
+"""File-queue processor for ``mt5_files/indicator_requests``.
+
+External scripts / EAs drop job files into the requests directory::
+
+    {"request_id": "1760559257492", "symbol": "EURUSD", "timeframe": "M30",
+     "lookback": 300, "indicators": [{"name": "RSI", "period": 14}, ...],
+     "series": false}
+
+``IndicatorJobProcessor`` watches the directory (``watchdog``), collects
+jobs for ``batch_ms``, fetches the closes once per distinct
+(symbol, timeframe, lookback), evaluates the union of requested specs once
+per fetch with the vectorised ``trader.core.indicators`` on a thread pool,
+and writes ``<request>.result.json`` next to each request.  Results are
+written to a temporary file and renamed into place, so readers never see a
+partial file.  Requests that already have a result are skipped, which makes
+restarts idempotent.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from trader.core import indicators as ind
+
+RESULT_SUFFIX = ".result.json"
+
+# (symbol, timeframe, bars) -> ascending closes
+FetchCloses = Callable[[str, str, int], np.ndarray]
+# (request path, job, normalised specs)
+Member = Tuple[Path, Dict[str, Any], List[Dict[str, Any]]]
+
+
+def result_path(request: Path) -> Path:
+    return request.with_name(request.stem + RESULT_SUFFIX)
+
+
+def is_request(path: Path) -> bool:
+    name = path.name
+    return name.endswith(".json") and not name.endswith(RESULT_SUFFIX) and not name.startswith(".")
+
+
+def write_atomic(path: Path, payload: Dict[str, Any]) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class _Handler(FileSystemEventHandler):
+    def __init__(self, owner: "IndicatorJobProcessor"):
+        self.owner = owner
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.owner.offer(Path(event.src_path))
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.owner.offer(Path(event.src_path))
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.owner.offer(Path(event.dest_path))
+
+
+class IndicatorJobProcessor:
+    """Watch a directory of indicator job files and answer them in place."""
+
+    def __init__(self, directory: Path, fetch_closes: FetchCloses, workers: int = 4, batch_ms: int = 50):
+        self.directory = Path(directory)
+        self.fetch_closes = fetch_closes
+        self.batch_s = batch_ms / 1000.0
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="indicator-jobs")
+        self._queue: "queue.Queue[Path]" = queue.Queue()
+        self._seen: Dict[Path, float] = {}  # request path -> mtime already handled
+        self._observer: Optional[Observer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.processed = 0
+        self.fetches = 0
+
+    # ------------------------------------------------------------------
+    def offer(self, path: Path) -> None:
+        if is_request(path):
+            self._queue.put(path)
+
+    def start(self) -> "IndicatorJobProcessor":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._observer = Observer()
+        self._observer.schedule(_Handler(self), str(self.directory), recursive=False)
+        self._observer.start()
+        for path in sorted(self.directory.glob("*.json")):  # backlog from before startup
+            self.offer(path)
+        self._thread = threading.Thread(target=self._run, name="indicator-jobs", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._pool.shutdown(wait=True)
+
+    # ------------------------------------------------------------------
+    def _load(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Parse a request once per version; ``None`` for handled, answered or half-written files."""
+
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        if self._seen.get(path) == mtime:
+            return None
+        res = result_path(path)
+        if res.exists() and res.stat().st_mtime >= mtime:
+            self._seen[path] = mtime
+            return None
+        try:
+            job = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None  # still being written; the next modified event retries
+        self._seen[path] = mtime
+        return job if isinstance(job, dict) else {}
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            paths = [first]
+            deadline = time.monotonic() + self.batch_s
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    paths.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            jobs = []
+            for path in dict.fromkeys(paths):
+                job = self._load(path)
+                if job is not None:
+                    jobs.append((path, job))
+            if jobs:
+                try:
+                    self.process(jobs)
+                except Exception as e:  # keep watching; the next change retries
+                    logger.exception(f"indicator jobs: batch failed: {e}")
+
+    # ------------------------------------------------------------------
+    def process(self, jobs: List[Tuple[Path, Dict[str, Any]]]) -> None:
+        """Group jobs by (symbol, timeframe, lookback) and evaluate each group on the pool."""
+
+        groups: Dict[Tuple[str, str, int], List[Member]] = {}
+        for path, job in jobs:
+            try:
+                key = (str(job["symbol"]), str(job.get("timeframe", "M30")).upper(), int(job.get("lookback", 300)))
+                specs = job.get("indicators") or []
+                if not isinstance(specs, list):
+                    raise ValueError("indicators must be a list")
+                specs = [ind.normalize(spec) for spec in specs]
+            except (KeyError, TypeError, ValueError) as e:
+                self._answer(path, job, error=f"invalid request: {e}")
+                continue
+            groups.setdefault(key, []).append((path, job, specs))
+        self.fetches += len(groups)
+        futures = {self._pool.submit(self._run_group, key, members): members for key, members in groups.items()}
+        for f, members in futures.items():
+            try:
+                f.result()
+            except Exception as e:  # never let one group take the watcher down
+                logger.exception(f"indicator jobs: group failed: {e}")
+                for path, job, _ in members:
+                    self._answer(path, job, error=f"internal error: {e}")
+
+    def _run_group(self, key: Tuple[str, str, int], members: List[Member]) -> None:
+        symbol, timeframe, lookback = key
+        specs: Dict[str, Dict[str, Any]] = {}
+        for _, _, job_specs in members:
+            for spec in job_specs:
+                specs.setdefault(ind.spec_key(spec), spec)
+        try:
+            bars = max([lookback] + [ind.warmup(s) * 3 for s in specs.values()])
+            closes = np.asarray(self.fetch_closes(symbol, timeframe, bars), dtype=float)
+            if not len(closes):
+                raise RuntimeError("no rates")
+        except Exception as e:
+            for path, job, _ in members:
+                self._answer(path, job, error=str(e))
+            return
+        # one vectorised pass per distinct spec, shared by every job in the group
+        full: Dict[str, Any] = {}
+        for k, spec in specs.items():
+            try:
+                full[k] = ind.compute(spec, closes)
+            except Exception as e:
+                full[k] = e
+        for path, job, job_specs in members:
+            keys = [ind.spec_key(spec) for spec in job_specs]
+            failed = [str(full[k]) for k in keys if isinstance(full[k], Exception)]
+            if failed:
+                self._answer(path, job, error="; ".join(failed))
+                continue
+            series = bool(job.get("series", False))
+            values = {k: ind.jsonify(full[k], series=series, tail=max(1, lookback)) for k in keys}
+            self._answer(path, job, indicators=values, bars=len(closes))
+
+    def _answer(self, path: Path, job: Dict[str, Any], *, indicators=None, bars: int = 0, error: str = "") -> None:
+        payload = {
+            "request_id": job.get("request_id", path.stem),
+            "symbol": job.get("symbol"),
+            "timeframe": job.get("timeframe"),
+            "lookback": job.get("lookback"),
+            "ok": not error,
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if error:
+            payload["error"] = error
+        else:
+            payload["bars"] = bars
+            payload["indicators"] = indicators
+        try:
+            write_atomic(result_path(path), payload)
+            self.processed += 1
+        except OSError as e:
+            logger.warning(f"indicator job {path.name}: cannot write result: {e}")
@@ -0,0 +1,149 @@
+"""Vectorised technical indicators over close-price arrays.
+
+Every function takes a 1-D float array and returns a full series of the same
+length computed in a single pass (pandas' C-level ``ewm``), so callers can
+read the latest value with ``[-1]`` or ship the whole series.
+
+``compute`` evaluates the declarative specs used by ``/indicators/batch`` and
+the request files under ``mt5_files/indicator_requests``::
+
+    {"name": "RSI", "period": 14}
+    {"name": "EMA", "period": 21}
+    {"name": "MACD", "fast": 12, "slow": 26, "signal": 9}
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def ema(closes: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average seeded with the first value (``adjust=False``)."""
+
+    closes = np.asarray(closes, dtype=float)
+    if period <= 1:
+        return closes.copy()
+    return pd.Series(closes).ewm(span=period, adjust=False).mean().to_numpy()
+
+
+def sma(closes: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average; the first ``period - 1`` values are NaN."""
+
+    return pd.Series(np.asarray(closes, dtype=float)).rolling(period).mean().to_numpy()
+
+
+def rsi(closes: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder RSI; the first value (no prior close) is NaN."""
+
+    closes = np.asarray(closes, dtype=float)
+    diff = np.diff(closes, prepend=np.nan)
+    gains = pd.Series(np.where(diff > 0, diff, 0.0))
+    losses = pd.Series(np.where(diff < 0, -diff, 0.0))
+    alpha = 1.0 / period
+    avg_gain = gains.iloc[1:].ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    avg_loss = losses.iloc[1:].ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    rs = avg_gain / np.maximum(avg_loss, 1e-12)
+    out = np.full(len(closes), np.nan)
+    out[1:] = 100.0 - 100.0 / (1.0 + rs)
+    return out
+
+
+def macd(closes: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    """MACD line (EMA fast - EMA slow), its signal EMA and the histogram."""
+
+    line = ema(closes, fast) - ema(closes, slow)
+    sig = ema(line, signal)
+    return {"macd": line, "signal": sig, "hist": line - sig}
+
+
+# ----------------------------------------------------------------------
+# Declarative specs
+# ----------------------------------------------------------------------
+_PARAMS = {"EMA": ("period",), "SMA": ("period",), "RSI": ("period",), "MACD": ("fast", "slow", "signal")}
+
+
+def normalize(spec: Any) -> Dict[str, Any]:
+    """Validated copy of a spec; a bare name (``"RSI"``) means default params.
+
+    Raises ``ValueError`` for unknown indicators and non-positive or
+    non-integer parameters, before anything is computed.
+    """
+
+    if isinstance(spec, str):
+        spec = {"name": spec}
+    if not isinstance(spec, Mapping):
+        raise ValueError(f"indicator spec must be an object or a name, got {spec!r}")
+    name = str(spec.get("name", "")).upper()
+    if name not in _PARAMS:
+        raise ValueError(f"Unsupported indicator {spec.get('name')!r}")
+    out = dict(spec, name=name)
+    for p in _PARAMS[name]:
+        if p in spec:
+            try:
+                v = int(spec[p])
+            except (TypeError, ValueError):
+                raise ValueError(f"{name} {p} must be an integer, got {spec[p]!r}") from None
+            if v <= 0:
+                raise ValueError(f"{name} {p} must be positive, got {v}")
+            out[p] = v
+    return out
+
+
+def spec_key(spec: Mapping[str, Any]) -> str:
+    """Stable result key for a spec, e.g. ``RSI_14`` or ``MACD_12_26_9``."""
+
+    name = str(spec.get("name", "")).upper()
+    if name == "MACD":
+        return f"MACD_{spec.get('fast', 12)}_{spec.get('slow', 26)}_{spec.get('signal', 9)}"
+    return f"{name}_{spec.get('period', 14)}"
+
+
+def warmup(spec: Mapping[str, Any]) -> int:
+    """Bars needed before the indicator has settled."""
+
+    if str(spec.get("name", "")).upper() == "MACD":
+        return int(spec.get("slow", 26)) + int(spec.get("signal", 9))
+    return int(spec.get("period", 14)) + 1
+
+
+def compute(spec: Mapping[str, Any], closes: np.ndarray) -> Any:
+    """Evaluate one spec and return its full series (MACD returns a dict of series)."""
+
+    name = str(spec.get("name", "")).upper()
+    if name == "EMA":
+        return ema(closes, int(spec.get("period", 14)))
+    if name == "SMA":
+        return sma(closes, int(spec.get("period", 14)))
+    if name == "RSI":
+        return rsi(closes, int(spec.get("period", 14)))
+    if name == "MACD":
+        return macd(closes, int(spec.get("fast", 12)), int(spec.get("slow", 26)), int(spec.get("signal", 9)))
+    raise ValueError(f"Unsupported indicator {spec.get('name')!r}")
+
+
+def _jsonable(arr: np.ndarray, digits: int) -> Any:
+    return [None if np.isnan(v) else v for v in np.round(arr, digits).tolist()]
+
+
+def _last(arr: np.ndarray, digits: int) -> Any:
+    if not len(arr) or np.isnan(arr[-1]):
+        return None
+    return round(float(arr[-1]), digits)
+
+
+def jsonify(res: Any, *, series: bool = False, digits: int = 6, tail: Optional[int] = None) -> Any:
+    """JSON-ready form of a ``compute`` result: the latest value, or the last ``tail`` values with ``series``."""
+
+    fmt = _jsonable if series else _last
+    if isinstance(res, dict):
+        return {k: fmt(v[-tail:] if tail else v, digits) for k, v in res.items()}
+    return fmt(res[-tail:] if tail else res, digits)
+
+
+def evaluate(specs, closes: np.ndarray, *, series: bool = False, digits: int = 6) -> Dict[str, Any]:
+    """Evaluate many specs over the same closes; values are JSON-ready."""
+
+    return {spec_key(spec): jsonify(compute(spec, closes), series=series, digits=digits) for spec in specs}
@@ -0,0 +1,214 @@
+"""Process-sharded live engine.
+
+``run_live`` normally drives every symbol from one event loop, so all the
+strategy / risk / pivot work of a large universe shares one core.  With
+``live.workers > 1`` in ``config.yaml`` the symbols are dealt round-robin to
+worker processes; each worker builds its own ``Engine`` (own feeds, own
+paper broker holding ``starting_cash / workers``) and runs its symbols.
+
+Workers never write the shared log files themselves.  ``QueueSignalLogger``
+forwards ``record_signal`` / ``resolve_signal`` to the coordinator, which
+owns the one real ``SignalLogger`` (``signals.db``, ``signals.jsonl``), and
+every ``heartbeat_s`` each worker reports its equity, paper positions
+and per-symbol health.  The coordinator aggregates those into
+``logs/live_status.json`` and restarts workers that die.
+
+A (re)started worker is handed the open signals of its symbols, so their
+SL/TP still resolve them, and -- after a crash -- the cash and positions of
+its last heartbeat instead of a fresh paper account.
+
+Configured in ``trader/config.yaml``::
+
+    live:
+      workers: 4            # 1 = single process
+      starting_cash: 10000
+      heartbeat_s: 5
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+import uuid
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from .broker_paper import PaperBroker, Position
+from .signal_logger import SignalLogger
+
+# (cfg, broker=..., signal_logger=...) -> Engine; must be importable by spawned workers
+EngineFactory = Callable[..., Any]
+
+
+def shard_symbols(symbols: List[str], workers: int) -> List[List[str]]:
+    """Deal symbols round-robin so every worker gets a similar load."""
+
+    workers = max(1, min(int(workers), len(symbols)))
+    return [symbols[i::workers] for i in range(workers)]
+
+
+class QueueSignalLogger:
+    """Worker-side ``SignalLogger`` stand-in that forwards events to the coordinator."""
+
+    def __init__(self, events, worker: int):
+        self.events = events
+        self.worker = worker
+
+    def record_signal(self, **fields) -> str:
+        sig_id = uuid.uuid4().hex
+        self.events.put(("signal", self.worker, {"sig_id": sig_id, **fields}))
+        return sig_id
+
+    def resolve_signal(self, sig_id: str, *, exit_price: float, outcome: str) -> None:
+        self.events.put(("result", self.worker, {"sig_id": sig_id, "exit_price": exit_price, "outcome": outcome}))
+
+
+def _worker_main(index: int, symbols: List[str], cfg: Dict[str, Any], factory: EngineFactory,
+                 events, cash: float, heartbeat_s: float,
+                 positions: Dict[str, List[float]], open_signals: List[Dict[str, Any]]) -> None:
+    logger.remove()
+    logger.add(sys.stderr, format=f"[w{index}] {{time:HH:mm:ss}} {{level}} {{message}}")
+    broker = PaperBroker(starting_cash=cash)
+    broker.pos = {sym: Position(qty, avg) for sym, (qty, avg) in positions.items()}
+    engine = factory(cfg, broker=broker, signal_logger=QueueSignalLogger(events, index))
+    resumed = engine.resume_open_trades(open_signals)
+    if resumed or positions:
+        logger.info(f"resumed {resumed} open signals, {len(positions)} positions")
+
+    async def heartbeat():
+        while True:
+            events.put(("health", index, {
+                "pid": os.getpid(),
+                "symbols": symbols,
+                "equity": engine.broker.equity,
+                "cash": engine.broker.cash,
+                "positions": {sym: [p.qty, p.avg] for sym, p in engine.broker.pos.items() if p.qty},
+                "feeds": {sym: dict(h) for sym, h in engine.health.items()},
+                "at": time.time(),
+            }))
+            await asyncio.sleep(heartbeat_s)
+
+    async def main():
+        hb = asyncio.create_task(heartbeat())
+        try:
+            await engine.run(symbols, cfg["timeframe"])
+        finally:
+            hb.cancel()
+
+    asyncio.run(main())
+
+
+class ShardCoordinator:
+    """Start one engine process per symbol shard and aggregate what they report."""
+
+    def __init__(self, cfg: Dict[str, Any], factory: EngineFactory, log_dir: Path):
+        live = cfg.get("live") or {}
+        self.cfg = cfg
+        self.factory = factory
+        self.shards = shard_symbols(list(cfg["symbols"]), int(live.get("workers", os.cpu_count() or 1)))
+        self.cash = float(live.get("starting_cash", 10_000.0)) / len(self.shards)
+        self.heartbeat_s = float(live.get("heartbeat_s", 5.0))
+        self.status_path = Path(log_dir) / "live_status.json"
+        self.signal_logger = SignalLogger(Path(log_dir))
+        self._ctx = mp.get_context("spawn")
+        self.events = self._ctx.Queue()
+        self.procs: List[Optional[mp.Process]] = [None] * len(self.shards)
+        self.health: Dict[int, Dict[str, Any]] = {}
+        self.restarts = [0] * len(self.shards)
+
+    # ------------------------------------------------------------------
+    def _start(self, i: int) -> None:
+        # a restarted worker carries on from its last heartbeat, not a fresh account
+        last = self.health.get(i, {})
+        cash = last.get("cash", self.cash)
+        positions = last.get("positions", {})
+        symbols = set(self.shards[i])
+        open_signals = [asdict(r) for r in self.signal_logger.state.values() if r.symbol in symbols]
+        p = self._ctx.Process(
+            target=_worker_main,
+            args=(i, self.shards[i], self.cfg, self.factory, self.events, cash, self.heartbeat_s,
+                  positions, open_signals),
+            name=f"live-shard-{i}", daemon=True,
+        )
+        p.start()
+        self.procs[i] = p
+        logger.info(f"shard {i}: pid={p.pid} symbols={','.join(self.shards[i])}")
+
+    def _handle(self, kind: str, worker: int, payload: Dict[str, Any]) -> None:
+        if kind == "signal":
+            self.signal_logger.record_signal(**payload)
+        elif kind == "result":
+            self.signal_logger.resolve_signal(payload["sig_id"], exit_price=payload["exit_price"],
+                                              outcome=payload["outcome"])
+        elif kind == "health":
+            self.health[worker] = payload
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                self._handle(*self.events.get_nowait())
+            except queue.Empty:
+                return
+
+    def status(self) -> Dict[str, Any]:
+        now = time.time()
+        workers = []
+        for i, p in enumerate(self.procs):
+            h = self.health.get(i, {})
+            workers.append({
+                "worker": i,
+                "pid": p.pid if p else None,
+                "alive": bool(p and p.is_alive()),
+                "restarts": self.restarts[i],
+                "symbols": self.shards[i],
+                "equity": h.get("equity"),
+                "heartbeat_age_s": round(now - h["at"], 1) if h.get("at") else None,
+                "feeds": h.get("feeds", {}),
+            })
+        return {
+            "generated_at": now,
+            "equity": round(sum(w["equity"] or 0.0 for w in workers), 2),
+            "open_signals": sum(1 for r in self.signal_logger.state.values() if r.status == "open"),
+            "workers": workers,
+        }
+
+    def _write_status(self) -> None:
+        tmp = self.status_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.status(), indent=2), encoding="utf-8")
+        os.replace(tmp, self.status_path)
+
+    # ------------------------------------------------------------------
+    def run(self) -> None:
+        for i in range(len(self.shards)):
+            self._start(i)
+        next_status = 0.0
+        try:
+            while True:
+                try:
+                    self._handle(*self.events.get(timeout=1.0))
+                except queue.Empty:
+                    pass
+                now = time.time()
+                if now < next_status:
+                    continue
+                next_status = now + self.heartbeat_s
+                dead = [i for i, p in enumerate(self.procs) if p is not None and not p.is_alive()]
+                if dead:
+                    self._drain()  # signals a dead worker sent before exiting
+                for i in dead:
+                    self.restarts[i] += 1
+                    logger.warning(f"shard {i} exited ({self.procs[i].exitcode}); restarting")
+                    self._start(i)
+                self._write_status()
+        finally:
+            for p in self.procs:
+                if p is not None and p.is_alive():
+                    p.terminate()
@@ -0,0 +1,160 @@
+"""Minimal Prometheus-style metrics without locks on the hot path.
+
+Every collector keeps one shard per thread (``threading.local``); a thread
+only ever mutates its own shard, so recording is a couple of dict/list
+operations with no locking.  ``Registry.render()`` sums the shards when
+``/metrics`` is scraped and emits the Prometheus text exposition format.
+
+Usage::
+
+    REQUESTS = REGISTRY.counter("http_requests_total", "HTTP requests", ("route",))
+    REQUESTS.inc(route="/candles")
+    LATENCY = REGISTRY.histogram("mt5_call_seconds", "MT5 call latency", ("call",))
+    LATENCY.observe(0.004, call="copy_rates_from_pos")
+    REGISTRY.gauge("ws_subscribers", "Connected subscribers", lambda: len(clients))
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = ['%s="%s"' % (n, str(v).replace("\\", "\\\\").replace('"', '\\"')) for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Sharded:
+    """Per-thread shards of a dict; readers merge all shards."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[dict] = []
+
+    def shard(self) -> dict:
+        d = getattr(self._local, "d", None)
+        if d is None:
+            d = self._local.d = {}
+            self._shards.append(d)  # list.append is atomic
+        return d
+
+    def shards(self) -> List[dict]:
+        return list(self._shards)
+
+
+class Counter(_Sharded):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()):
+        super().__init__()
+        self.name, self.doc, self.labels = name, doc, tuple(labels)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        d = self.shard()
+        d[key] = d.get(key, 0.0) + amount
+
+    def totals(self) -> Dict[Tuple[str, ...], float]:
+        out: Dict[Tuple[str, ...], float] = {}
+        for d in self.shards():
+            for k, v in list(d.items()):
+                out[k] = out.get(k, 0.0) + v
+        return out
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_fmt_labels(self.labels, k)} {v:g}" for k, v in sorted(self.totals().items())]
+
+
+class Histogram(_Sharded):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__()
+        self.name, self.doc, self.labels = name, doc, tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        d = self.shard()
+        row = d.get(key)
+        if row is None:
+            # [per-bucket counts..., +Inf count, sum]
+            row = d[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect.bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def render(self) -> List[str]:
+        merged: Dict[Tuple[str, ...], List[float]] = {}
+        for d in self.shards():
+            for k, row in list(d.items()):
+                acc = merged.setdefault(k, [0] * len(row))
+                for i, v in enumerate(row):
+                    acc[i] += v
+        lines: List[str] = []
+        for k, row in sorted(merged.items()):
+            cum = 0
+            for le, n in zip(self.buckets, row):
+                cum += n
+                lbl = _fmt_labels(self.labels, k, 'le="%g"' % le)
+                lines.append(f"{self.name}_bucket{lbl} {cum:g}")
+            cum += row[len(self.buckets)]
+            lbl = _fmt_labels(self.labels, k, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{lbl} {cum:g}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labels, k)} {row[-1]:g}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labels, k)} {cum:g}")
+        return lines
+
+
+class Gauge:
+    """Value computed at scrape time by ``fn``; may return a number or ``{label_values: number}``."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, doc: str, fn: Callable[[], object], labels: Sequence[str] = ()):
+        self.name, self.doc, self.fn, self.labels = name, doc, fn, tuple(labels)
+
+    def render(self) -> List[str]:
+        try:
+            val = self.fn()
+        except Exception:
+            return []
+        if isinstance(val, dict):
+            return [f"{self.name}{_fmt_labels(self.labels, k if isinstance(k, tuple) else (k,))} {v:g}"
+                    for k, v in sorted(val.items())]
+        return [f"{self.name} {float(val):g}"]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def _add(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, doc: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, doc, labels))
+
+    def histogram(self, name: str, doc: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, doc, labels, buckets))
+
+    def gauge(self, name: str, doc: str, fn: Callable[[], object], labels: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, doc, fn, labels))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for m in self._metrics.values():
+            lines.append(f"# HELP {m.name} {m.doc}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
@@ -0,0 +1,145 @@
+"""Serialized access to the ``MetaTrader5`` module.
+
+The ``MetaTrader5`` package drives a single terminal connection through
+process-global state, so concurrent calls from FastAPI's threadpool and the
+event loop contend for it (and block the loop when called inline).
+``MT5Executor`` funnels every call through one dedicated thread:
+
+* ``executor.copy_rates_from_pos(...)`` blocks the calling (worker) thread
+  until the MT5 thread has run the call,
+* ``await executor.aio.copy_ticks_from(...)`` is the async facade for code
+  running on the event loop,
+* identical read calls that overlap in time are coalesced (single-flight):
+  the second caller simply waits on the first caller's future.
+
+Constants (``TIMEFRAME_M1`` ...) are still read from the wrapped module.
+
+With ``max_workers > 1`` the wrapped object must be safe to call from
+several threads, e.g. an ``MT5GatewayPool`` whose per-terminal workers
+serialize themselves (see trader/core/mt5_pool.py).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Calls without side effects; identical concurrent invocations share one MT5 round-trip.
+READ_CALLS = frozenset({
+    "account_info",
+    "copy_rates_from",
+    "copy_rates_from_pos",
+    "copy_rates_range",
+    "copy_ticks_from",
+    "copy_ticks_range",
+    "orders_get",
+    "positions_get",
+    "symbol_info",
+    "symbol_info_tick",
+    "symbols_get",
+    "symbols_total",
+    "terminal_info",
+})
+
+
+class _AsyncFacade:
+    def __init__(self, owner: "MT5Executor"):
+        self._owner = owner
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        async def call(*args, **kwargs):
+            return await asyncio.wrap_future(self._owner.submit(name, *args, **kwargs))
+        return call
+
+
+class MT5Executor:
+    """Run MT5 calls on one dedicated thread with single-flight read coalescing."""
+
+    def __init__(self, module: Any, observe: Optional[Callable[[str, float], None]] = None, max_workers: int = 1):
+        self.module = module
+        self.observe = observe  # called with (call name, seconds) after every MT5 call
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="mt5-io")
+        self._local = threading.local()
+        self._inflight: Dict[Tuple[Hashable, ...], Future] = {}
+        self._lock = threading.Lock()
+        self.aio = _AsyncFacade(self)
+        self.coalesced = 0
+
+    # ------------------------------------------------------------------
+    def _run(self, name: str, args, kwargs):
+        self._local.inside = True
+        if self.observe is None:
+            return getattr(self.module, name)(*args, **kwargs)
+        t0 = time.perf_counter()
+        try:
+            return getattr(self.module, name)(*args, **kwargs)
+        finally:
+            self.observe(name, time.perf_counter() - t0)
+
+    # ------------------------------------------------------------------
+    def submit(self, name: str, *args, **kwargs) -> Future:
+        """Schedule ``module.<name>(*args, **kwargs)`` and return its future."""
+
+        key = None
+        if name in READ_CALLS:
+            key = (name, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                key = None
+        if key is None:
+            return self._pool.submit(self._run, name, args, kwargs)
+
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                return fut
+            fut = self._pool.submit(self._run, name, args, kwargs)
+            self._inflight[key] = fut
+
+        def _forget(_f, key=key):
+            with self._lock:
+                if self._inflight.get(key) is _f:
+                    del self._inflight[key]
+
+        fut.add_done_callback(_forget)
+        return fut
+
+    # ------------------------------------------------------------------
+    def call(self, name: str, *args, **kwargs):
+        """Blocking call; runs inline when already on an MT5 thread."""
+
+        if getattr(self._local, "inside", False):
+            return getattr(self.module, name)(*args, **kwargs)
+        return self.submit(name, *args, **kwargs).result()
+
+    def call_with_error(self, name: str, *args, **kwargs) -> Tuple[Any, Any]:
+        """Blocking call returning ``(result, last_error)``.
+
+        The error is read right after a None/False result on the same MT5
+        thread, so concurrent calls on other threads cannot replace it.
+        """
+
+        def run():
+            result = self._run(name, args, kwargs)
+            if result is None or result is False:
+                return result, self.module.last_error()
+            return result, None
+
+        if getattr(self._local, "inside", False):
+            return run()
+        return self._pool.submit(run).result()
+
+    # ------------------------------------------------------------------
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+    # ------------------------------------------------------------------
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False)
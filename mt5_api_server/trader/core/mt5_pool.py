@@ -0,0 +1,247 @@
+"""Pool of MT5 gateway processes, one terminal each, with symbols sharded by hash.
+
+The ``MetaTrader5`` package binds a process to a single terminal, so one
+API process serializes every rate, tick and order call through that one
+connection.  ``MT5GatewayPool`` starts one worker process per configured
+terminal and routes each call over a pipe to the worker that owns the
+call's symbol (``crc32(symbol) % workers``):
+
+* symbol calls (``copy_rates_*``, ``copy_ticks_*``, ``symbol_info*``,
+  ``symbol_select``, ``order_send``) go to the owning worker,
+* ``positions_get`` / ``orders_get`` without a symbol fan out to every
+  worker and merge by ticket,
+* ``initialize`` / ``shutdown`` run on every worker,
+* everything else (``account_info``, ``symbols_get`` ...) goes to worker 0.
+
+The pool quacks like the module: constants (``TIMEFRAME_M1`` ...) are read
+from the parent's module and functions are routed, so it can be wrapped by
+``MT5Executor`` unchanged.  Calls to different workers run in parallel;
+calls to the same worker are serialized by that worker's lock.  A worker
+process that died is respawned on its next call and re-initialized with the
+arguments of its last successful ``initialize``; ``on_respawn(index)`` is then
+called, so callers can drop per-terminal state (e.g. selected symbols).
+
+Configured in ``trader/config.yaml``::
+
+    mt5_gateway:
+      terminals:
+        - "C:/MT5/terminal-a/terminal64.exe"
+        - "C:/MT5/terminal-b/terminal64.exe"
+
+Any importable module with the MetaTrader5 API can back the workers
+(``fake_mt5`` with ``MT5_BACKEND=fake``).
+"""
+
+from __future__ import annotations
+
+import importlib
+import multiprocessing as mp
+import os
+import threading
+import zlib
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Calls routed by their ``symbol`` (first positional argument or keyword).
+SYMBOL_CALLS = frozenset({
+    "copy_rates_from",
+    "copy_rates_from_pos",
+    "copy_rates_range",
+    "copy_ticks_from",
+    "copy_ticks_range",
+    "symbol_info",
+    "symbol_info_tick",
+    "symbol_select",
+})
+# Account-wide lists: per-symbol when a symbol is given, otherwise merged from all workers.
+MERGED_CALLS = frozenset({"positions_get", "orders_get"})
+BROADCAST_CALLS = frozenset({"initialize", "shutdown"})
+
+
+class Record(SimpleNamespace):
+    """Picklable stand-in for MT5's named-tuple records (``AccountInfo``, ``TradePosition`` ...)."""
+
+    def _asdict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+
+def _portable(value: Any) -> Any:
+    """Convert MT5 results into plain picklable values (numpy arrays pass through)."""
+
+    if value is None or isinstance(value, (bool, int, float, str, bytes, np.ndarray)):
+        return value
+    if hasattr(value, "_asdict"):
+        return Record(**{k: _portable(v) for k, v in value._asdict().items()})
+    if isinstance(value, (tuple, list)):
+        return type(value)(_portable(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _portable(v) for k, v in value.items()}
+    return value
+
+
+def _serve(conn, module_name: str, index: int, path: Optional[str]) -> None:
+    """Worker process loop: run ``(name, args, kwargs)`` requests against this worker's terminal."""
+
+    os.environ["MT5_GATEWAY_WORKER"] = str(index)
+    module = importlib.import_module(module_name)
+    while True:
+        try:
+            name, args, kwargs = conn.recv()
+        except (EOFError, OSError):
+            break
+        if name == "initialize" and path and not args and "path" not in kwargs:
+            args = (path,)
+        try:
+            result = getattr(module, name)(*args, **kwargs)
+            err = module.last_error() if result is None or result is False else None
+            conn.send((True, _portable(result), err))
+        except Exception as e:  # report, keep serving
+            conn.send((False, f"{type(e).__name__}: {e}", None))
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, ctx, module_name: str, index: int, path: Optional[str],
+                 on_respawn: Optional[Callable[[int], None]] = None):
+        self.module_name, self.index, self.path = module_name, index, path
+        self.on_respawn = on_respawn
+        self._ctx = ctx
+        self.lock = threading.Lock()
+        self.proc = None
+        self.conn = None
+        self.restarts = 0
+        self._init: Optional[tuple] = None  # (args, kwargs) of the last successful initialize
+        self.start()
+
+    def start(self) -> None:
+        """(Re)spawn the worker process; a respawned one is re-initialized like its predecessor."""
+
+        parent, child = self._ctx.Pipe()
+        self.proc = self._ctx.Process(
+            target=_serve, args=(child, self.module_name, self.index, self.path),
+            name=f"mt5-gateway-{self.index}", daemon=True,
+        )
+        self.proc.start()
+        child.close()
+        self.conn = parent
+        if self._init is not None:
+            self.restarts += 1
+            reply = self._roundtrip("initialize", *self._init)
+            if not (reply[0] and reply[1]):
+                self._init = None  # stays uninitialized until the next initialize call
+
+    def _roundtrip(self, name: str, args, kwargs):
+        try:
+            self.conn.send((name, args, kwargs))
+            return self.conn.recv()
+        except (EOFError, OSError) as e:
+            return False, f"gateway worker {self.index} lost: {e}", None
+
+    def call(self, name: str, args, kwargs):
+        with self.lock:
+            if not self.proc.is_alive():
+                self.start()  # terminal process died: bring it back
+                if self.on_respawn is not None:
+                    self.on_respawn(self.index)
+            reply = self._roundtrip(name, args, kwargs)
+            if name == "initialize":
+                self._init = (args, kwargs) if reply[0] and reply[1] else None
+            elif name == "shutdown":
+                self._init = None
+            return reply
+
+    def stop(self) -> None:
+        with self.lock:
+            try:
+                self.conn.close()
+            except OSError:
+                pass
+            self.proc.join(timeout=5)
+            if self.proc.is_alive():
+                self.proc.terminate()
+
+
+class MT5GatewayPool:
+    """Module-like facade over one gateway process per MT5 terminal."""
+
+    def __init__(self, module: Any, terminals: Sequence[Optional[str]]):
+        if not terminals:
+            raise ValueError("MT5GatewayPool needs at least one terminal")
+        self.module = module  # parent-side module, used for constants only
+        # called with the worker index after a dead worker was respawned (new terminal session)
+        self.on_respawn: Optional[Callable[[int], None]] = None
+        ctx = mp.get_context("spawn")
+        self.workers: List[_Worker] = [
+            _Worker(ctx, module.__name__, i, str(t) if t else None, self._respawned)
+            for i, t in enumerate(terminals)
+        ]
+        # like MT5, last_error() reflects the most recent call -- of the calling thread
+        self._local = threading.local()
+
+    def _respawned(self, index: int) -> None:
+        if self.on_respawn is not None:
+            self.on_respawn(index)
+
+    # ------------------------------------------------------------------
+    def shard(self, symbol: str) -> int:
+        return zlib.crc32(symbol.encode("utf-8")) % len(self.workers)
+
+    def _symbol_of(self, name: str, args, kwargs) -> Optional[str]:
+        if name == "order_send":
+            req = args[0] if args else kwargs.get("request") or {}
+            return req.get("symbol") if isinstance(req, dict) else getattr(req, "symbol", None)
+        if name in SYMBOL_CALLS or name in MERGED_CALLS:
+            if args and isinstance(args[0], str):
+                return args[0]
+            return kwargs.get("symbol")
+        return None
+
+    def _unwrap(self, reply):
+        ok, value, err = reply
+        if not ok:
+            self._local.error = (-1, value)
+            raise RuntimeError(value)
+        self._local.error = err if err is not None else (1, "Success")
+        return value
+
+    def last_error(self):
+        """Error carried by the reply of this thread's most recent call."""
+
+        return getattr(self._local, "error", (1, "Success"))
+
+    # ------------------------------------------------------------------
+    def call(self, name: str, *args, **kwargs):
+        if name == "last_error":
+            return self.last_error()
+        symbol = self._symbol_of(name, args, kwargs)
+        if symbol is not None:
+            return self._unwrap(self.workers[self.shard(symbol)].call(name, args, kwargs))
+        if name in BROADCAST_CALLS:
+            results = [self._unwrap(w.call(name, args, kwargs)) for w in self.workers]
+            return all(r is not False for r in results) if name == "initialize" else None
+        if name in MERGED_CALLS:
+            merged: Dict[int, Any] = {}
+            for w in self.workers:
+                for item in self._unwrap(w.call(name, args, kwargs)) or ():
+                    merged.setdefault(getattr(item, "ticket", id(item)), item)
+            return tuple(merged.values())
+        return self._unwrap(self.workers[0].call(name, args, kwargs))
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self.module, name)
+        if not callable(attr):
+            return attr
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+    # ------------------------------------------------------------------
+    def stats(self) -> List[Dict[str, Any]]:
+        return [{"worker": w.index, "terminal": w.path, "alive": w.proc.is_alive(), "pid": w.proc.pid,
+                 "restarts": w.restarts} for w in self.workers]
+
+    def close(self) -> None:
+        for w in self.workers:
+            w.stop()
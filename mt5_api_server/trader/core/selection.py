@@ -10,6 +10,7 @@ selection without keeping the file open.
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
 from threading import RLock
@@ -71,10 +72,13 @@ class StrategySelectionStore:
     def set(self, strategies: Iterable[str]) -> None:
         with self._lock:
             self._enabled = set(strategies)
-            self.path.write_text(
+            # written aside and renamed so watchers (trader.core.control) never see a partial file
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(
                 json.dumps({"strategies": sorted(self._enabled)}, indent=2),
                 encoding="utf-8",
             )
+            os.replace(tmp, self.path)
             try:
                 self._mtime = self.path.stat().st_mtime
             except FileNotFoundError:
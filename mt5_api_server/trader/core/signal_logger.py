@@ -9,6 +9,8 @@ from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Dict, Optional
 
+from .signal_store import SignalStore
+
 
 @dataclass
 class SignalRecord:
@@ -32,56 +34,36 @@ class SignalRecord:
 
 
 class SignalLogger:
-    """Append-only JSONL log with a mirrored state file for easy querying."""
+    """Signal lifecycle log backed by ``SignalStore`` (SQLite) plus the ``signals.jsonl`` audit trail.
+
+    Only open signals are kept in memory (``state``); closed ones live in the
+    store.  Writes are queued and committed off the caller's thread.
+    """
 
     def __init__(self, base_dir: Path):
         self.base_dir = base_dir
         self.base_dir.mkdir(parents=True, exist_ok=True)
         self.log_path = self.base_dir / "signals.jsonl"
-        self.state_path = self.base_dir / "signals_state.json"
-        self.levels_path = self.base_dir / "levels.json"
-        self.state: Dict[str, SignalRecord] = {}
-
-        if self.state_path.exists():
-            try:
-                raw = json.loads(self.state_path.read_text(encoding="utf-8"))
-                for item in raw.get("signals", []):
-                    rec = SignalRecord(**item)
-                    self.state[rec.id] = rec
-            except Exception:
-                self.state = {}
-
-        self._write_levels()
+        self.store = SignalStore(self.base_dir / "signals.db", journal_path=self.log_path)
+        self._migrate(self.base_dir / "signals_state.json")
+        self.state: Dict[str, SignalRecord] = {
+            row["id"]: SignalRecord(**row) for row in self.store.query(status="open", limit=None)
+        }
 
     # ------------------------------------------------------------------
-    def _append(self, payload: Dict) -> None:
-        with self.log_path.open("a", encoding="utf-8") as fh:
-            fh.write(json.dumps(payload) + "\n")
+    def _migrate(self, legacy: Path) -> None:
+        """Import the pre-SQLite ``signals_state.json`` once, into an empty store."""
 
-    # ------------------------------------------------------------------
-    def _write_state(self) -> None:
-        data = {"signals": [asdict(rec) for rec in sorted(self.state.values(), key=lambda r: r.opened_at)]}
-        self.state_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
-        self._write_levels()
+        if not legacy.exists() or self.store.count():
+            return
+        try:
+            raw = json.loads(legacy.read_text(encoding="utf-8"))
+            self.store.import_records(raw.get("signals", []))
+        except Exception:
+            pass
 
-    # ------------------------------------------------------------------
-    def _write_levels(self) -> None:
-        active = [
-            {
-                "id": rec.id,
-                "symbol": rec.symbol,
-                "strategy": rec.strategy,
-                "side": rec.side,
-                "entry": rec.entry_price,
-                "stop": rec.stop_loss,
-                "target": rec.take_profit,
-                "pivot": rec.pivot,
-            }
-            for rec in self.state.values()
-            if rec.status == "open"
-        ]
-        payload = {"levels": active, "generated_at": time.time()}
-        self.levels_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return self.store.flush(timeout)
 
     # ------------------------------------------------------------------
     def record_signal(
@@ -97,8 +79,9 @@ class SignalLogger:
         take_profit: float,
         pivot: Optional[float],
         qty: float,
+        sig_id: Optional[str] = None,
     ) -> str:
-        sig_id = uuid.uuid4().hex
+        sig_id = sig_id or uuid.uuid4().hex
         rec = SignalRecord(
             id=sig_id,
             symbol=symbol,
@@ -114,13 +97,12 @@ class SignalLogger:
             opened_at=time.time(),
         )
         self.state[sig_id] = rec
-        self._append({"event": "signal", **asdict(rec)})
-        self._write_state()
+        self.store.put(asdict(rec), event="signal")
         return sig_id
 
     # ------------------------------------------------------------------
     def resolve_signal(self, sig_id: str, *, exit_price: float, outcome: str) -> None:
-        rec = self.state.get(sig_id)
+        rec = self.state.pop(sig_id, None)
         if not rec:
             return
         rec.status = "closed"
@@ -129,6 +111,5 @@ class SignalLogger:
         rec.outcome = outcome
         delta = exit_price - rec.entry_price
         rec.pnl = delta * rec.qty if rec.side == "BUY" else -delta * rec.qty
-        self._append({"event": "result", **asdict(rec)})
-        self._write_state()
+        self.store.put(asdict(rec), event="result")
 
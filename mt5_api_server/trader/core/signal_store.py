@@ -0,0 +1,225 @@
+"""Indexed, append-friendly storage for strategy signals.
+
+``SignalLogger`` used to rewrite ``signals_state.json`` (every signal ever
+seen, pretty-printed) and ``levels.json`` on each event, synchronously on
+the engine loop.  ``SignalStore`` keeps the records in SQLite instead:
+
+* WAL journal, so the API server reads while the engine writes,
+* one row per signal, upserted by id -- O(1) per event,
+* writes are queued and *group-committed* by a background thread (everything
+  queued while the previous commit ran goes into the next transaction), and
+  the matching ``signals.jsonl`` audit lines are appended in the same batch,
+* indexes on status / symbol / strategy / opened_at, so
+  ``/strategy/signals?limit=`` touches ``limit`` rows, not the history.
+
+Every write gets an increasing ``seq``; ``MAX(seq)`` is the store's version
+(ETag) for conditional GETs.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+COLUMNS = (
+    "id", "symbol", "timeframe", "strategy", "side", "reason",
+    "entry_price", "stop_loss", "take_profit", "pivot", "qty", "opened_at",
+    "status", "closed_at", "exit_price", "outcome", "pnl",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    id          TEXT PRIMARY KEY,
+    symbol      TEXT NOT NULL,
+    timeframe   TEXT,
+    strategy    TEXT NOT NULL,
+    side        TEXT,
+    reason      TEXT,
+    entry_price REAL,
+    stop_loss   REAL,
+    take_profit REAL,
+    pivot       REAL,
+    qty         REAL,
+    opened_at   REAL NOT NULL,
+    status      TEXT NOT NULL,
+    closed_at   REAL,
+    exit_price  REAL,
+    outcome     TEXT,
+    pnl         REAL,
+    seq         INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS signals_opened ON signals(opened_at);
+CREATE INDEX IF NOT EXISTS signals_status ON signals(status, opened_at);
+CREATE INDEX IF NOT EXISTS signals_symbol ON signals(symbol, opened_at);
+CREATE INDEX IF NOT EXISTS signals_status_symbol ON signals(status, symbol, opened_at);
+CREATE INDEX IF NOT EXISTS signals_strategy ON signals(strategy, opened_at);
+CREATE INDEX IF NOT EXISTS signals_seq ON signals(seq);
+"""
+
+_UPSERT = (
+    f"INSERT OR REPLACE INTO signals ({', '.join(COLUMNS)}, seq) "
+    f"VALUES ({', '.join('?' for _ in COLUMNS)}, ?)"
+)
+
+
+class SignalStore:
+    """SQLite-backed signal records with a background group-commit writer."""
+
+    def __init__(self, path: Path, *, journal_path: Optional[Path] = None, max_batch: int = 1000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.journal_path = journal_path
+        self.max_batch = max_batch
+        self._local = threading.local()
+        self._queue: "queue.Queue[Optional[Tuple[str, Any]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        self._seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM signals").fetchone()[0]
+        self.commits = 0
+        self.failed = 0  # rows lost to failed group commits
+
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        """Per-thread read connection."""
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # ------------------------------------------------------------------
+    def put(self, record: Dict[str, Any], event: Optional[str] = None) -> None:
+        """Queue an upsert of ``record``; ``event`` also appends it to the JSONL journal."""
+
+        if self._writer is None:
+            self._start()
+        self._queue.put(("put", (record, event)))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is committed."""
+
+        if self._writer is None or not self._writer.is_alive():
+            return self._queue.empty()
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout=10)
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="signal-store", daemon=True)
+                self._writer.start()
+                atexit.register(self.close)
+
+    def _run(self) -> None:
+        conn = self._connect()
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            # group commit: take whatever queued up while the last commit ran
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            puts, waiters = [], []
+            for item in batch:
+                if item is None:
+                    stop = True
+                elif item[0] == "flush":
+                    waiters.append(item[1])
+                else:
+                    puts.append(item[1])
+            try:
+                rows, lines = [], []
+                for record, event in puts:
+                    self._seq += 1
+                    rows.append(tuple(record.get(c) for c in COLUMNS) + (self._seq,))
+                    if event and self.journal_path is not None:
+                        lines.append(json.dumps({"event": event, **record}) + "\n")
+                if rows:
+                    with conn:
+                        conn.executemany(_UPSERT, rows)
+                    self.commits += 1
+                if lines:
+                    with self.journal_path.open("a", encoding="utf-8") as fh:
+                        fh.write("".join(lines))
+            except Exception as e:  # keep the writer alive; this batch is lost
+                self.failed += len(puts)
+                logger.error(f"signal store: group commit of {len(puts)} records failed: {e}")
+            finally:
+                for w in waiters:
+                    w.set()
+        conn.close()
+
+    # ------------------------------------------------------------------
+    def version(self) -> int:
+        return self._conn().execute("SELECT COALESCE(MAX(seq), 0) FROM signals").fetchone()[0]
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM signals").fetchone()[0]
+
+    def query(
+        self,
+        *,
+        status: Optional[str] = None,
+        symbol: Optional[str] = None,
+        strategy: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = 200,
+    ) -> List[Dict[str, Any]]:
+        """Newest ``limit`` matching signals (by ``opened_at``), returned oldest first."""
+
+        where, args = [], []
+        for col, val in (("status", status), ("symbol", symbol), ("strategy", strategy)):
+            if val is not None:
+                where.append(f"{col} = ?")
+                args.append(val)
+        if since is not None:
+            where.append("opened_at >= ?")
+            args.append(since)
+        if until is not None:
+            where.append("opened_at < ?")
+            args.append(until)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM signals"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY opened_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        rows = self._conn().execute(sql, args).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in reversed(rows)]
+
+    def import_records(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Synchronously load existing records (migration from ``signals_state.json``)."""
+
+        rows = []
+        for rec in records:
+            self._seq += 1
+            rows.append(tuple(rec.get(c) for c in COLUMNS) + (self._seq,))
+        conn = self._conn()
+        with conn:
+            conn.executemany(_UPSERT, rows)
+        return len(rows)
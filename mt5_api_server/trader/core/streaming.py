@@ -0,0 +1,206 @@
+"""Streaming (O(1) per bar) indicator primitives for incremental strategies.
+
+The live feed re-sends the forming bar on every tick, so each primitive
+separates *committed* state (closed bars) from a *peek* at the forming bar:
+
+* ``push(...)`` commits a closed bar,
+* ``peek(...)`` returns the value as if the given forming bar were appended,
+  without changing state -- so repeated updates of one bar cost O(1) and
+  agree with a full recompute over ``closed bars + forming bar``.
+
+Definitions match the pandas expressions used by the DataFrame strategies:
+
+* ``EMA``          ``s.ewm(span=n, adjust=False).mean()`` (or ``alpha=``)
+* ``WilderATR``    ``TR.ewm(alpha=1/n, adjust=False).mean()``, first TR = high - low
+* ``RollingMeanVar`` ``s.tail(n).mean()`` / ``s.tail(n).std(ddof=0)``
+* ``RollingMax`` / ``RollingMin`` monotonic-deque window extrema
+
+``BarStream`` tracks which bar is forming and tells a strategy when to commit.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from .types import Candle
+
+
+class EMA:
+    """Recursive exponential moving average seeded with the first value.
+
+    Uses the exact arithmetic of pandas' ``adjust=False`` recursion (alpha
+    derived via the centre of mass), so values match ``ewm`` bit for bit.
+    """
+
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, span: Optional[float] = None, *, alpha: Optional[float] = None):
+        if alpha is not None:
+            com = (1.0 - alpha) / alpha
+        elif span is not None:
+            com = (float(span) - 1.0) / 2.0
+        else:
+            raise ValueError("EMA needs span or alpha")
+        self.alpha = 1.0 / (1.0 + com)
+        self.value: Optional[float] = None
+
+    def peek(self, x: float) -> float:
+        if self.value is None:
+            return float(x)
+        old = 1.0 - self.alpha
+        return (old * self.value + self.alpha * float(x)) / (old + self.alpha)
+
+    def push(self, x: float) -> float:
+        self.value = self.peek(x)
+        return self.value
+
+
+class WilderATR:
+    """Wilder-smoothed average true range."""
+
+    __slots__ = ("ema", "prev_close")
+
+    def __init__(self, period: int):
+        self.ema = EMA(alpha=1.0 / period)
+        self.prev_close: Optional[float] = None
+
+    def true_range(self, h: float, l: float) -> float:
+        tr = h - l
+        if self.prev_close is not None:
+            tr = max(tr, abs(h - self.prev_close), abs(l - self.prev_close))
+        return tr
+
+    def peek(self, h: float, l: float) -> float:
+        return self.ema.peek(self.true_range(h, l))
+
+    def push(self, h: float, l: float, c: float) -> float:
+        v = self.ema.push(self.true_range(h, l))
+        self.prev_close = c
+        return v
+
+
+class RollingMeanVar:
+    """Mean and population variance of the last ``n`` values (committed + forming).
+
+    Keeps shifted running sums (shift = first value seen) to limit
+    cancellation, and re-sums the window every ``n`` commits so rounding
+    error cannot accumulate over a long session.
+    """
+
+    __slots__ = ("n", "_win", "_k", "_s1", "_s2", "_since")
+
+    def __init__(self, n: int):
+        if n <= 0:
+            raise ValueError("window must be positive")
+        self.n = int(n)
+        self._win: Deque[float] = deque(maxlen=self.n - 1 if self.n > 1 else 0)
+        self._k: Optional[float] = None
+        self._s1 = 0.0
+        self._s2 = 0.0
+        self._since = 0
+
+    def _resum(self) -> None:
+        k = self._k or 0.0
+        self._s1 = sum(v - k for v in self._win)
+        self._s2 = sum((v - k) * (v - k) for v in self._win)
+        self._since = 0
+
+    def push(self, x: float) -> None:
+        x = float(x)
+        if self._k is None:
+            self._k = x
+        if self._win.maxlen == 0:
+            return
+        if len(self._win) == self._win.maxlen:
+            old = self._win[0] - self._k
+            self._s1 -= old
+            self._s2 -= old * old
+        self._win.append(x)
+        d = x - self._k
+        self._s1 += d
+        self._s2 += d * d
+        self._since += 1
+        if self._since >= self.n:
+            self._resum()
+
+    def peek(self, x: float) -> Tuple[float, float]:
+        """(mean, variance) of the committed window plus ``x``."""
+
+        k = self._k if self._k is not None else float(x)
+        d = float(x) - k
+        m = len(self._win) + 1
+        s1, s2 = self._s1 + d, self._s2 + d * d
+        mean = s1 / m
+        var = max(s2 / m - mean * mean, 0.0)
+        return mean + k, var
+
+    def peek_std(self, x: float) -> Tuple[float, float]:
+        mean, var = self.peek(x)
+        return mean, math.sqrt(var)
+
+
+class _Extremum:
+    """Monotonic deque over the last ``n`` committed values."""
+
+    __slots__ = ("n", "_dq", "_i")
+    _keep_left = staticmethod(lambda left, new: True)
+
+    def __init__(self, n: int):
+        self.n = max(0, int(n))
+        self._dq: Deque[Tuple[int, float]] = deque()
+        self._i = 0
+
+    def push(self, x: float) -> None:
+        x = float(x)
+        dq = self._dq
+        while dq and not self._keep_left(dq[-1][1], x):
+            dq.pop()
+        dq.append((self._i, x))
+        self._i += 1
+        while dq and dq[0][0] <= self._i - 1 - self.n:
+            dq.popleft()
+
+    def value(self) -> Optional[float]:
+        """Extremum of the last ``n`` committed values (None while empty)."""
+
+        return self._dq[0][1] if (self._dq and self.n) else None
+
+
+class RollingMax(_Extremum):
+    __slots__ = ()
+    _keep_left = staticmethod(lambda left, new: left > new)
+
+
+class RollingMin(_Extremum):
+    __slots__ = ()
+    _keep_left = staticmethod(lambda left, new: left < new)
+
+
+class BarStream:
+    """Forming-bar bookkeeping: which bar is pending and how many bars exist."""
+
+    __slots__ = ("pending", "closed")
+
+    def __init__(self):
+        self.pending: Optional[Candle] = None
+        self.closed = 0  # committed (closed) bars
+
+    def __len__(self) -> int:
+        return self.closed + (1 if self.pending is not None else 0)
+
+    def advance(self, bar: Candle) -> Optional[Candle]:
+        """Make ``bar`` the forming bar; returns the previous one when ``bar`` opened a new bar.
+
+        Late updates for an older bar are ignored (the forming bar stays).
+        """
+
+        prev = self.pending
+        if prev is not None and bar.ts < prev.ts:
+            return None
+        self.pending = bar
+        if prev is not None and bar.ts != prev.ts:
+            self.closed += 1
+            return prev
+        return None
@@ -0,0 +1,192 @@
+"""Append-only on-disk tick history with memory-mapped reads.
+
+Layout under ``root``::
+
+    <root>/<SYMBOL>/<YYYYMMDD>.ticks   fixed-width TICK_DTYPE records, time ordered
+    <root>/<SYMBOL>/<YYYYMMDD>.idx     sparse time index: (time_msc, record_no)
+                                       for every ``INDEX_EVERY``-th record
+
+Writers only ever append, so a segment can be read with ``numpy.memmap``
+while it is being written.  Readers binary-search the tiny index first and
+then the mapped ``time_msc`` column inside one index block, so a range
+lookup touches a handful of pages and returns zero-copy views.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+TICK_DTYPE = np.dtype([
+    ("time_msc", "<i8"),
+    ("bid", "<f8"),
+    ("ask", "<f8"),
+    ("last", "<f8"),
+    ("volume", "<f8"),
+    ("flags", "<i8"),
+])
+TICK_MEDIA_TYPE = "application/vnd.mt5.ticks"
+INDEX_DTYPE = np.dtype([("time_msc", "<i8"), ("record", "<i8")])
+INDEX_EVERY = 1024
+DAY_MS = 86_400_000
+
+
+def _day_name(day: int) -> str:
+    return datetime.fromtimestamp(day * 86400, tz=timezone.utc).strftime("%Y%m%d")
+
+
+def ticks_to_records(ticks: np.ndarray) -> np.ndarray:
+    """Convert an MT5 ticks array (``copy_ticks_*``) to ``TICK_DTYPE`` records."""
+
+    out = np.empty(len(ticks), dtype=TICK_DTYPE)
+    names = ticks.dtype.names or ()
+    for name in ("time_msc", "bid", "ask", "last", "flags"):
+        out[name] = ticks[name] if name in names else 0
+    out["volume"] = ticks["volume_real"] if "volume_real" in names else ticks["volume"]
+    return out
+
+
+class _Segment:
+    """Open append handles for one symbol/day."""
+
+    def __init__(self, data_path: Path, idx_path: Path):
+        self.data = data_path.open("ab")
+        self.idx = idx_path.open("ab")
+        self.count = data_path.stat().st_size // TICK_DTYPE.itemsize
+
+    def close(self) -> None:
+        self.data.close()
+        self.idx.close()
+
+
+class TickRecorder:
+    """Append ticks to per-symbol, per-day segment files.
+
+    Ticks at or before the last recorded ``time_msc`` of a symbol are
+    skipped, so several pollers can feed the same symbol without duplicates.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._segments: Dict[Tuple[str, int], _Segment] = {}
+        self._last: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    def _segment(self, symbol: str, day: int) -> _Segment:
+        key = (symbol, day)
+        seg = self._segments.get(key)
+        if seg is None:
+            # a new day closes yesterday's handles for this symbol
+            for old in [k for k in self._segments if k[0] == symbol]:
+                self._segments.pop(old).close()
+            d = self.root / symbol
+            d.mkdir(parents=True, exist_ok=True)
+            name = _day_name(day)
+            seg = self._segments[key] = _Segment(d / f"{name}.ticks", d / f"{name}.idx")
+        return seg
+
+    # ------------------------------------------------------------------
+    def _last_recorded(self, symbol: str) -> int:
+        last = self._last.get(symbol)
+        if last is None:
+            last = 0
+            files = sorted((self.root / symbol).glob("*.ticks")) if (self.root / symbol).exists() else []
+            if files and files[-1].stat().st_size >= TICK_DTYPE.itemsize:
+                mm = np.memmap(files[-1], dtype=TICK_DTYPE, mode="r")
+                last = int(mm["time_msc"][-1])
+                del mm
+            self._last[symbol] = last
+        return last
+
+    # ------------------------------------------------------------------
+    def append(self, symbol: str, ticks: np.ndarray) -> int:
+        """Record MT5 ticks; returns the number of new records written."""
+
+        if ticks is None or len(ticks) == 0:
+            return 0
+        recs = ticks_to_records(ticks)
+        with self._lock:
+            recs = recs[recs["time_msc"] > self._last_recorded(symbol)]
+            if not len(recs):
+                return 0
+            days = recs["time_msc"] // DAY_MS
+            for day in np.unique(days):
+                part = recs[days == day]
+                seg = self._segment(symbol, int(day))
+                first = seg.count
+                seg.data.write(part.tobytes())
+                seg.data.flush()
+                # index every INDEX_EVERY-th record that landed in this batch
+                marks = np.arange(-(-first // INDEX_EVERY) * INDEX_EVERY, first + len(part), INDEX_EVERY)
+                if len(marks):
+                    idx = np.empty(len(marks), dtype=INDEX_DTYPE)
+                    idx["record"] = marks
+                    idx["time_msc"] = part["time_msc"][marks - first]
+                    seg.idx.write(idx.tobytes())
+                    seg.idx.flush()
+                seg.count += len(part)
+            self._last[symbol] = int(recs["time_msc"][-1])
+            return len(recs)
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        with self._lock:
+            for seg in self._segments.values():
+                seg.close()
+            self._segments.clear()
+
+
+class TickReader:
+    """Zero-copy range reads over the segments written by ``TickRecorder``."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    # ------------------------------------------------------------------
+    def symbols(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
+
+    # ------------------------------------------------------------------
+    def _slice(self, path: Path, from_msc: int, to_msc: int) -> Optional[np.ndarray]:
+        size = path.stat().st_size // TICK_DTYPE.itemsize
+        if size == 0:
+            return None
+        mm = np.memmap(path, dtype=TICK_DTYPE, mode="r", shape=(size,))
+        times = mm["time_msc"]
+        idx_path = path.with_suffix(".idx")
+        lo_rec, hi_rec = 0, size
+        if idx_path.exists() and idx_path.stat().st_size >= INDEX_DTYPE.itemsize:
+            idx = np.fromfile(idx_path, dtype=INDEX_DTYPE)
+            i = int(np.searchsorted(idx["time_msc"], from_msc, side="left")) - 1
+            if i >= 0:
+                lo_rec = int(idx["record"][i])
+            j = int(np.searchsorted(idx["time_msc"], to_msc, side="right"))
+            if j < len(idx):
+                hi_rec = min(size, int(idx["record"][j]) + 1)
+        lo = lo_rec + int(np.searchsorted(times[lo_rec:hi_rec], from_msc, side="left"))
+        hi = lo_rec + int(np.searchsorted(times[lo_rec:hi_rec], to_msc, side="right"))
+        if hi <= lo:
+            return None
+        return mm[lo:hi]
+
+    # ------------------------------------------------------------------
+    def read(self, symbol: str, from_msc: int, to_msc: int) -> Iterator[np.ndarray]:
+        """Yield memory-mapped record views covering ``[from_msc, to_msc]``, one per day segment."""
+
+        d = self.root / symbol
+        if not d.exists() or to_msc < from_msc:
+            return
+        first, last = _day_name(from_msc // DAY_MS), _day_name(to_msc // DAY_MS)
+        for path in sorted(d.glob("*.ticks")):
+            if first <= path.stem <= last:
+                part = self._slice(path, from_msc, to_msc)
+                if part is not None:
+                    yield part
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import math
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Dict, Tuple
@@ -12,6 +13,10 @@ import requests
 import yaml
 from loguru import logger
 
+from trader.core.bars import CANDLE_DTYPE, TF_SECONDS
+
+CANDLES_MAX_LIMIT = 10000  # server-side cap of /candles; longer spans use /candles/{symbol}/range
+
 def load_cfg() -> dict:
     here = Path(__file__).resolve().parent
     for p in (Path.cwd() / "config.yaml", here / "config.yaml"):
@@ -37,22 +42,36 @@ class HistoryFeed:
         self.base = base_http.rstrip("/")
         self.s = _direct_session()
     def candles(self, symbol: str, timeframe: str, limit: int = 10000) -> pd.DataFrame:
-        safe_limit = min(int(limit), 5000)
-        url = f"{self.base}/candles/{symbol}?timeframe={timeframe}&limit={safe_limit}"
-        r = self.s.get(url, timeout=60); r.raise_for_status()
-        arr = r.json()
-        if not arr: raise RuntimeError(f"No candles returned for {symbol} {timeframe}")
-        df = pd.DataFrame(arr)
-        if "time" in df.columns:
-            if isinstance(df.loc[0, "time"], str):
-                df["ts"] = pd.to_datetime(df["time"], utc=True).astype("int64") // 10**9
-            else:
-                t0 = int(df.loc[0, "time"])
-                df["ts"] = (df["time"] // 1000).astype(int) if t0 > 10**12 else df["time"].astype(int)
-        cols = {"open":"o","high":"h","low":"l","close":"c","tick_volume":"v","real_volume":"v"}
-        for src, dst in cols.items():
-            if src in df.columns: df[dst] = df[src]
-        return df[["ts","o","h","l","c","v"]].dropna().sort_values("ts").reset_index(drop=True)
+        """Newest ``limit`` bars; beyond the /candles cap the span is pulled from /candles/range."""
+        if int(limit) <= CANDLES_MAX_LIMIT:
+            url = f"{self.base}/candles/{symbol}?timeframe={timeframe}&limit={int(limit)}&format=binary"
+            r = self.s.get(url, timeout=60); r.raise_for_status()
+            return self._frame(np.frombuffer(r.content, dtype=CANDLE_DTYPE), symbol, timeframe)
+        end = int(time.time())
+        df = self.range(symbol, timeframe, end - int(limit) * TF_SECONDS.get(timeframe.upper(), 60), end)
+        return df.tail(int(limit)).reset_index(drop=True)
+
+    def range(self, symbol: str, timeframe: str, start: int, end: Optional[int] = None) -> pd.DataFrame:
+        """Bars opened in ``[start, end]`` (epoch seconds), streamed as binary pages."""
+        params = {"timeframe": timeframe, "from": int(start), "format": "binary"}
+        if end is not None: params["to"] = int(end)
+        parts: List[np.ndarray] = []; tail = b""
+        with self.s.get(f"{self.base}/candles/{symbol}/range", params=params, stream=True, timeout=300) as r:
+            r.raise_for_status()
+            for chunk in r.iter_content(chunk_size=1 << 20):
+                buf = tail + chunk
+                n = len(buf) // CANDLE_DTYPE.itemsize * CANDLE_DTYPE.itemsize
+                if n: parts.append(np.frombuffer(buf[:n], dtype=CANDLE_DTYPE))
+                tail = buf[n:]
+        arr = np.concatenate(parts) if parts else np.empty(0, dtype=CANDLE_DTYPE)
+        return self._frame(arr, symbol, timeframe)
+
+    @staticmethod
+    def _frame(arr: np.ndarray, symbol: str, timeframe: str) -> pd.DataFrame:
+        if not len(arr): raise RuntimeError(f"No candles returned for {symbol} {timeframe}")
+        df = pd.DataFrame({"ts": arr["time"], "o": arr["open"], "h": arr["high"],
+                           "l": arr["low"], "c": arr["close"], "v": arr["volume"]})
+        return df.dropna().sort_values("ts").reset_index(drop=True)
 
 class Side: BUY="BUY"; SELL="SELL"; FLAT="FLAT"
 @dataclass
@@ -226,6 +245,7 @@ def main():
     base_http = cfg["server"]["base_http"]
     timeframe = cfg.get("timeframe", "M1")
     symbols = cfg.get("symbols", ["EURUSD"])
+    bt_cfg = cfg.get("backtest") or {}
 
     feed = HistoryFeed(base_http)
 
@@ -247,7 +267,11 @@ def main():
 
     for sym in symbols:
         logger.info(f"Fetching {sym} {timeframe} candles…")
-        df = feed.candles(sym, timeframe, limit=5000)
+        if bt_cfg.get("days"):
+            end = int(time.time())
+            df = feed.range(sym, timeframe, end - int(float(bt_cfg["days"]) * 86400), end)
+        else:
+            df = feed.candles(sym, timeframe, limit=int(bt_cfg.get("bars", 5000)))
 
         for name, strat in strategies.items():
             logger.info(f"Backtesting {name} on {sym}…")
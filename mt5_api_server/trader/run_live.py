@@ -1,11 +1,16 @@
 import asyncio
+from dataclasses import asdict
 from pathlib import Path
 
 import yaml
 from loguru import logger
 
-from trader.core.feed import HistoryFeed, LiveFeed
+from trader.core.feed import LiveFeed
+from trader.core.history_cache import CachedHistoryFeed
+from trader.core.broker_paper import PaperBroker
+from trader.core.control import ControlPlane
 from trader.core.engine import Engine
+from trader.core.live_shards import ShardCoordinator
 from trader.core.risk import RiskManager
 from trader.core.selection import StrategySelectionStore
 from trader.core.signal_logger import SignalLogger
@@ -16,38 +21,52 @@ from trader.strategies.range_fade import RangeFade
 from trader.strategies.turtle_dennis import TurtleDennis
 
 
-def build_engine(cfg):
-    hf=HistoryFeed(cfg["server"]["base_http"])
-    lf=LiveFeed(cfg["server"]["base_ws"])
-    # instantiate strategies from cfg
-    strats={}
-    if "ema_cross" in cfg["strategies"]:
-        p=cfg["strategies"]["ema_cross"]
-        strats["ema_cross"]=EMACross(**p)
-    if "range_fade" in cfg["strategies"]:
-        p=cfg["strategies"]["range_fade"]
-        strats["range_fade"]=RangeFade(**p)
-    if "oco_breakout" in cfg["strategies"]:
-        p=cfg["strategies"]["oco_breakout"]
-        strats["oco_breakout"]=OCOBreakout(**p)
-    if "turtle_dennis" in cfg["strategies"]:
-        p=cfg["strategies"]["turtle_dennis"]
-        strats["turtle_dennis"]=TurtleDennis(**p)
+CONFIG_PATH=Path("config.yaml")
+
+STRATEGIES={
+    "ema_cross": EMACross,
+    "range_fade": RangeFade,
+    "oco_breakout": OCOBreakout,
+    "turtle_dennis": TurtleDennis,
+}
+
+def build_strategies(cfg):
+    # instantiate strategies from cfg (also used by the control plane on param changes)
+    return {name: STRATEGIES[name](**(p or {})) for name, p in cfg["strategies"].items() if name in STRATEGIES}
+
+def build_engine(cfg, *, broker=None, signal_logger=None):
+    base_dir = Path(__file__).resolve().parent / "logs"
+    # warmup bars cached on disk; restarts only fetch bars newer than the cache
+    hf=CachedHistoryFeed(cfg["server"]["base_http"], base_dir / "history")
+    lf=LiveFeed(cfg["server"]["base_ws"], history=hf)  # one multiplexed socket; hf backfills reconnect gaps
+    strats=build_strategies(cfg)
     risk=RiskManager(max_risk_pct=cfg["risk"]["max_risk_pct"])
     sizer=FixedFractionSizer(risk_per_trade_pct=cfg["risk"]["risk_per_trade_pct"])
-    base_dir = Path(__file__).resolve().parent / "logs"
-    signal_logger = SignalLogger(base_dir)
+    signal_logger = signal_logger or SignalLogger(base_dir)
     selection_store = StrategySelectionStore(base_dir / "strategy_selection.json")
     if not selection_store.all():
         selection_store.set(strats.keys())
-    return Engine(lf, hf, strats, risk, sizer, signal_logger=signal_logger, selection_store=selection_store)
+    broker = broker or PaperBroker(starting_cash=float((cfg.get("live") or {}).get("starting_cash", 10_000.0)))
+    # selection / strategy param changes are pushed into the running engine
+    control = ControlPlane(selection_store.path, CONFIG_PATH, build_strategies)
+    return Engine(lf, hf, strats, risk, sizer, broker=broker, signal_logger=signal_logger, selection_store=selection_store,
+                  history_bars=int(cfg.get("history_bars", 2000)), control=control)
 
-async def main():
-    cfg=yaml.safe_load(open("config.yaml","r",encoding="utf-8"))
+async def run_single(cfg):
     eng=build_engine(cfg)
-    tasks=[eng.run_symbol(sym, cfg["timeframe"]) for sym in cfg["symbols"]]
-    await asyncio.gather(*tasks)
+    # signals left open by the previous run keep resolving on SL/TP
+    eng.resume_open_trades(asdict(rec) for rec in eng.signal_logger.state.values())
+    await eng.run(cfg["symbols"], cfg["timeframe"])
+
+def main():
+    cfg=yaml.safe_load(open(CONFIG_PATH,"r",encoding="utf-8"))
+    workers=int((cfg.get("live") or {}).get("workers", 1))
+    if workers>1 and len(cfg["symbols"])>1:
+        # symbols sharded across engine processes; see trader/core/live_shards.py
+        ShardCoordinator(cfg, build_engine, Path(__file__).resolve().parent / "logs").run()
+    else:
+        asyncio.run(run_single(cfg))
 
 if __name__=="__main__":
     logger.add("live.log", rotation="10 MB")
-    asyncio.run(main())
+    main()
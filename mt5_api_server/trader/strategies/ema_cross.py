@@ -1,22 +1,41 @@
 import pandas as pd
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
+from trader.core.streaming import EMA, BarStream
 from trader.core.types import Signal, Side
+from trader.strategies.incremental import Incremental
 
 @dataclass
 class State:
     last_side: Side = Side.FLAT
+    # streaming path (update/evaluate)
+    bars: BarStream = field(default_factory=BarStream)
+    ema_fast: Optional[EMA] = None
+    ema_slow: Optional[EMA] = None
 
-class EMACross:
+class EMACross(Incremental):
     def __init__(self, fast=21, slow=55):
         self.fast=fast; self.slow=slow
     def init(self, df:pd.DataFrame)->State:
-        return State()
+        state=State(ema_fast=EMA(self.fast), ema_slow=EMA(self.slow))
+        self.seed(df, state)
+        return state
     def on_candle(self, df:pd.DataFrame, state:State):
         if len(df)<self.slow+2: return None
         ema_fast=df['c'].ewm(span=self.fast, adjust=False).mean()
         ema_slow=df['c'].ewm(span=self.slow, adjust=False).mean()
         cross_up = ema_fast.iloc[-2] < ema_slow.iloc[-2] and ema_fast.iloc[-1] > ema_slow.iloc[-1]
         cross_dn = ema_fast.iloc[-2] > ema_slow.iloc[-2] and ema_fast.iloc[-1] < ema_slow.iloc[-1]
+        return self._signal(cross_up, cross_dn, state)
+    def _commit(self, bar, state:State):
+        state.ema_fast.push(bar.c); state.ema_slow.push(bar.c)
+    def evaluate(self, state:State):
+        if len(state.bars)<self.slow+2: return None
+        c=state.bars.pending.c
+        f2, s2 = state.ema_fast.value, state.ema_slow.value
+        f1, s1 = state.ema_fast.peek(c), state.ema_slow.peek(c)
+        return self._signal(f2 < s2 and f1 > s1, f2 > s2 and f1 < s1, state)
+    def _signal(self, cross_up, cross_dn, state:State):
         if cross_up and state.last_side!=Side.BUY:
             state.last_side=Side.BUY
             return Signal(side=Side.BUY, reason="EMA cross up", extras={})
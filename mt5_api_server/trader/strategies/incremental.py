@@ -0,0 +1,48 @@
+"""Optional O(1)-per-bar evaluation path for strategies.
+
+A strategy mixing in ``Incremental`` keeps streaming indicator state
+(``trader.core.streaming``) inside its ``State`` and implements:
+
+* ``_commit(bar, state)``  fold a closed bar into the committed primitives,
+* ``evaluate(state)``      signal for the forming bar (``state.bars.pending``).
+
+``update(bar, state)`` = ``advance`` + ``evaluate`` and returns the same
+signals as ``on_candle(df, state)`` would for ``df`` = history + ``bar``.
+The engine calls ``advance`` on every streamed bar (so indicator state never
+misses a bar) and ``evaluate`` only where it would have called ``on_candle``.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import pandas as pd
+
+from trader.core.streaming import BarStream
+from trader.core.types import Candle, Signal
+
+
+class Incremental:
+    def seed(self, df: pd.DataFrame, state) -> None:
+        """Replay warmup history (``ts/o/h/l/c/v`` frame) into the streaming state."""
+
+        state.bars = BarStream()
+        for row in zip(df["ts"].tolist(), df["o"].tolist(), df["h"].tolist(),
+                       df["l"].tolist(), df["c"].tolist(), df["v"].tolist()):
+            self.advance(Candle(*row), state)
+
+    def advance(self, bar: Candle, state) -> None:
+        closed = state.bars.advance(bar)
+        if closed is not None:
+            self._commit(closed, state)
+
+    def update(self, bar: Candle, state) -> Optional[Signal]:
+        self.advance(bar, state)
+        return self.evaluate(state)
+
+    # ------------------------------------------------------------------
+    def _commit(self, bar: Candle, state) -> None:
+        raise NotImplementedError
+
+    def evaluate(self, state) -> Optional[Signal]:
+        raise NotImplementedError
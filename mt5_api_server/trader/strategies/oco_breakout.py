@@ -1,18 +1,39 @@
 import pandas as pd
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
+from ..core.streaming import BarStream, RollingMax, RollingMin
 from ..core.types import Signal, Side
+from .incremental import Incremental
 
 @dataclass
-class State: pass
-class OCOBreakout:
+class State:
+    # streaming path (update/evaluate): extrema of the lookback-1 closed bars
+    bars: BarStream = field(default_factory=BarStream)
+    hi: Optional[RollingMax] = None
+    lo: Optional[RollingMin] = None
+class OCOBreakout(Incremental):
     def __init__(self, lookback=30):
         self.lookback=lookback
-    def init(self, df:pd.DataFrame)->State: return State()
+    def init(self, df:pd.DataFrame)->State:
+        state=State(hi=RollingMax(self.lookback-1), lo=RollingMin(self.lookback-1))
+        self.seed(df, state)
+        return state
     def on_candle(self, df:pd.DataFrame, state:State):
         if len(df)<self.lookback+1: return None
         hi=df['h'].tail(self.lookback).max()
         lo=df['l'].tail(self.lookback).min()
         px=df['c'].iloc[-1]
+        return self._signal(px, hi, lo)
+    def _commit(self, bar, state:State):
+        state.hi.push(bar.h); state.lo.push(bar.l)
+    def evaluate(self, state:State):
+        if len(state.bars)<self.lookback+1: return None
+        bar=state.bars.pending
+        hi=max(bar.h, state.hi.value() if state.hi.value() is not None else bar.h)
+        lo=min(bar.l, state.lo.value() if state.lo.value() is not None else bar.l)
+        return self._signal(bar.c, hi, lo)
+    @staticmethod
+    def _signal(px, hi, lo):
         if px>hi: return Signal(side=Side.BUY, reason="breakout_up", extras={})
         if px<lo: return Signal(side=Side.SELL, reason="breakout_dn", extras={})
         return None
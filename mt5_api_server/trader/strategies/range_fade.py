@@ -1,19 +1,37 @@
 import pandas as pd, numpy as np
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
+from trader.core.streaming import BarStream, RollingMeanVar
 from trader.core.types import Signal, Side
+from trader.strategies.incremental import Incremental
 
 @dataclass
-class State: pass
+class State:
+    # streaming path (update/evaluate)
+    bars: BarStream = field(default_factory=BarStream)
+    window: Optional[RollingMeanVar] = None
 
-class RangeFade:
+class RangeFade(Incremental):
     def __init__(self, lookback=50, z=1.5):
         self.lookback=lookback; self.z=z
-    def init(self, df:pd.DataFrame)->State: return State()
+    def init(self, df:pd.DataFrame)->State:
+        state=State(window=RollingMeanVar(self.lookback))
+        self.seed(df, state)
+        return state
     def on_candle(self, df:pd.DataFrame, state:State):
         if len(df)<self.lookback+5: return None
         s=df['c'].tail(self.lookback)
         mean=s.mean(); std=s.std(ddof=0) or 1e-9
         px=df['c'].iloc[-1]
+        return self._signal(px, mean, std)
+    def _commit(self, bar, state:State):
+        state.window.push(bar.c)
+    def evaluate(self, state:State):
+        if len(state.bars)<self.lookback+5: return None
+        px=state.bars.pending.c
+        mean, std = state.window.peek_std(px)
+        return self._signal(px, mean, std or 1e-9)
+    def _signal(self, px, mean, std):
         z=(px-mean)/std
         if z>self.z:  return Signal(side=Side.SELL, reason=f"z={z:.2f}", extras={})
         if z<-self.z: return Signal(side=Side.BUY,  reason=f"z={z:.2f}", extras={})
@@ -1,14 +1,22 @@
 import pandas as pd
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
+from trader.core.streaming import BarStream, RollingMax, RollingMin, WilderATR
 from trader.core.types import Signal, Side
+from trader.strategies.incremental import Incremental
 
 
 @dataclass
 class State:
     last_side: Side = Side.FLAT
+    # streaming path (update/evaluate): entry channel over closed bars + ATR
+    bars: BarStream = field(default_factory=BarStream)
+    hi: Optional[RollingMax] = None
+    lo: Optional[RollingMin] = None
+    atr: Optional[WilderATR] = None
 
 
-class TurtleDennis:
+class TurtleDennis(Incremental):
     def __init__(self, entry_channel: int = 55, exit_channel: int = 20, atr_period: int = 20, atr_mult: float = 2.0):
         self.entry_channel = entry_channel
         self.exit_channel = exit_channel
@@ -16,7 +24,13 @@ class TurtleDennis:
         self.atr_mult = atr_mult
 
     def init(self, df: pd.DataFrame) -> State:
-        return State()
+        state = State(
+            hi=RollingMax(self.entry_channel),
+            lo=RollingMin(self.entry_channel),
+            atr=WilderATR(self.atr_period),
+        )
+        self.seed(df, state)
+        return state
 
     def on_candle(self, df: pd.DataFrame, state: State):
         if len(df) < max(self.entry_channel, self.atr_period) + 2:
@@ -35,7 +49,21 @@ class TurtleDennis:
             axis=1,
         ).max(axis=1)
         atr = tr.ewm(alpha=1.0 / self.atr_period, adjust=False).mean().iloc[-1]
+        return self._signal(close, hi_entry, lo_entry, atr, state)
 
+    def _commit(self, bar, state: State) -> None:
+        state.hi.push(bar.h)
+        state.lo.push(bar.l)
+        state.atr.push(bar.h, bar.l, bar.c)
+
+    def evaluate(self, state: State):
+        if len(state.bars) < max(self.entry_channel, self.atr_period) + 2:
+            return None
+        bar = state.bars.pending
+        atr = state.atr.peek(bar.h, bar.l)
+        return self._signal(bar.c, state.hi.value(), state.lo.value(), atr, state)
+
+    def _signal(self, close, hi_entry, lo_entry, atr, state: State):
         if close > hi_entry and state.last_side != Side.BUY:
             state.last_side = Side.BUY
             return Signal(side=Side.BUY, reason=f"breakout_up N={self.entry_channel}", extras={"atr": float(atr)})